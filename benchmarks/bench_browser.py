@@ -0,0 +1,87 @@
+import argparse
+import time
+from typing import Callable, List
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pakselenium import PageElement, Selector, By, config
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+from pakselenium.utils import catch
+from pakselenium.utils.poll import PollPolicy
+
+URL = 'https://example.com/list'
+ROWS = Selector(By.CSS_SELECTOR, '.row', desc='rows')
+BUTTON = Selector(By.CSS_SELECTOR, '.button', desc='button')
+
+
+def make_pages(rows: int) -> List[FakePage]:
+    return [FakePage(URL, {
+        ROWS.locator: [FakeNode(f'row {i}', {'href': f'/item/{i}'}) for i in range(rows)],
+        BUTTON.locator: [FakeNode('button')],
+    })]
+
+
+def measure(name: str, func: Callable, browser, repeat: int):
+    executor = browser.driver.command_executor
+    executor.commands.clear()
+    tt = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    wall = (time.perf_counter() - tt) / repeat
+    round_trips = executor.round_trips / repeat
+    print(f'{name:<40} {wall * 1000:>10.2f} ms {round_trips:>10.1f}')
+
+
+def run(rows: int, latency: float, repeat: int):
+    browser = fake_browser(make_pages(rows), latency=latency)
+    browser.settings.poll_policy = PollPolicy(interval=0.01)
+    browser.go(URL, sleep=0)
+    print(f'{rows} rows, {latency * 1000:.1f} ms per command, mean of {repeat} runs')
+    print(f'{"scenario":<40} {"wall":>13} {"round trips":>10}')
+
+    measure('go', lambda: browser.go(URL, until=ROWS, sleep=0), browser, repeat)
+    measure('is_on_page', lambda: browser.is_on_page(ROWS), browser, repeat)
+    measure('find_element', lambda: browser.find_element(ROWS), browser, repeat)
+    measure('find_elements', lambda: browser.find_elements(ROWS), browser, repeat)
+    measure('find_elements + text', lambda: [i.text for i in browser.find_elements(ROWS)], browser, repeat)
+    measure('find_elements + prefetch', lambda: PageElement.prefetch(browser.find_elements(ROWS)), browser, repeat)
+    measure('find_elements_batched + text', lambda: [i.text for i in browser.find_elements_batched(ROWS)],
+            browser, repeat)
+    measure('find_elements_with_text', lambda: browser.find_elements_with_text(ROWS, f'row {rows - 1}'),
+            browser, repeat)
+    measure('click', lambda: browser.click(BUTTON, sleep=0), browser, repeat)
+    measure('wait_until_on_page', lambda: browser.wait_until_on_page(ROWS), browser, repeat)
+    measure('is_reached_page', lambda: browser.is_reached_page([ROWS, BUTTON], None, None, None), browser, repeat)
+    browser.settings.observe_dom = True
+    measure('is_reached_page (observe_dom)', lambda: browser.is_reached_page([ROWS, BUTTON], None, None, None),
+            browser, repeat)
+    browser.settings.observe_dom = False
+
+    executor = browser.driver.command_executor
+
+    @catch.staleElementReferenceException(sleep=None)
+    def stale(self):
+        return self.find_element(ROWS).text
+
+    def retried():
+        executor.fail('getElementText', 'stale element reference')
+        try:
+            stale(browser)
+        except StaleElementReferenceException:
+            pass
+
+    measure('stale text (resolved in place)', retried, browser, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='pakselenium overhead against a fake WebDriver')
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.001, help='seconds per WebDriver command')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    config.debug_verbose = 0
+    run(args.rows, args.latency, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
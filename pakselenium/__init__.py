@@ -1,7 +1,11 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
-from .browser import Browser, PageElement, Selector, log
+from .browser import Browser, PageElement, Selector, Settings, log
+from .pool import BrowserPool
+from .crawl import Crawler, CrawlResult
+from .async_browser import AsyncBrowser
 from .utils import expected_conditions as EC
+from .utils.conditions import TextCondition
 from .utils import helpers
 from .utils import catch
@@ -0,0 +1,130 @@
+from typing import Union, TYPE_CHECKING
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.remote.webelement import WebElement
+
+from pakselenium.utils.logs import logf
+
+if TYPE_CHECKING:
+    from pakselenium.browser import Browser, PageElement, Selector
+
+
+class Actions(object):
+    # queues pointer and key actions locally, perform() sends them as one W3C Actions request
+
+    def __init__(self, browser: 'Browser', sleep: float = 0.5, desc: str = None):
+        self.browser = browser
+        self.sleep = sleep
+        self.desc = desc
+        self.chain = ActionChains(browser.driver)
+        self.queued = []
+
+    def __repr__(self):
+        return f"Actions({self.queued})"
+
+    def __enter__(self) -> 'Actions':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.perform()
+        else:
+            self.reset()
+
+    def _element(self, target: Union['Selector', 'PageElement'], element_text: str = None,
+                 element_index: int = None) -> WebElement:
+        # elements are looked up while queueing and cannot be re-resolved once sent,
+        # so a cached handle that may be stale is not used
+        return self.browser.get_page_element(target, element_text=element_text, element_index=element_index,
+                                             cached=False).element
+
+    def move_to(self, target: Union['Selector', 'PageElement'], element_text: str = None, element_index: int = None,
+                x: int = None, y: int = None) -> 'Actions':
+        element = self._element(target, element_text, element_index)
+        if x is None and y is None:
+            self.chain.move_to_element(element)
+        else:
+            self.chain.move_to_element_with_offset(element, x or 0, y or 0)
+        self.queued.append(f'move_to:{target}')
+        return self
+
+    def move_by(self, x: int, y: int) -> 'Actions':
+        self.chain.move_by_offset(x, y)
+        self.queued.append(f'move_by:{x},{y}')
+        return self
+
+    def click(self, target: Union['Selector', 'PageElement'] = None, element_text: str = None,
+              element_index: int = None) -> 'Actions':
+        # without a target clicks at the current pointer position
+        element = None if target is None else self._element(target, element_text, element_index)
+        self.chain.click(element)
+        self.queued.append(f'click:{target}')
+        return self
+
+    def double_click(self, target: Union['Selector', 'PageElement'] = None, element_text: str = None,
+                     element_index: int = None) -> 'Actions':
+        element = None if target is None else self._element(target, element_text, element_index)
+        self.chain.double_click(element)
+        self.queued.append(f'double_click:{target}')
+        return self
+
+    def context_click(self, target: Union['Selector', 'PageElement'] = None, element_text: str = None,
+                      element_index: int = None) -> 'Actions':
+        element = None if target is None else self._element(target, element_text, element_index)
+        self.chain.context_click(element)
+        self.queued.append(f'context_click:{target}')
+        return self
+
+    def drag_and_drop(self, source: Union['Selector', 'PageElement'], target: Union['Selector', 'PageElement'],
+                      source_text: str = None, target_text: str = None,
+                      source_index: int = None, target_index: int = None) -> 'Actions':
+        source_element = self._element(source, source_text, source_index)
+        target_element = self._element(target, target_text, target_index)
+        self.chain.drag_and_drop(source_element, target_element)
+        self.queued.append(f'drag_and_drop:{source}->{target}')
+        return self
+
+    def key_down(self, key: str) -> 'Actions':
+        self.chain.key_down(key)
+        self.queued.append(f'key_down:{key!r}')
+        return self
+
+    def key_up(self, key: str) -> 'Actions':
+        self.chain.key_up(key)
+        self.queued.append(f'key_up:{key!r}')
+        return self
+
+    def press(self, key: str) -> 'Actions':
+        self.chain.key_down(key).key_up(key)
+        self.queued.append(f'press:{key!r}')
+        return self
+
+    def send_keys(self, *keys: str) -> 'Actions':
+        # to the focused element
+        self.chain.send_keys(*keys)
+        self.queued.append(f'send_keys:{keys!r}')
+        return self
+
+    def pause(self, seconds: float) -> 'Actions':
+        # runs in the browser as part of the request, no extra round trip
+        self.chain.pause(seconds)
+        self.queued.append(f'pause:{seconds}')
+        return self
+
+    def perform(self):
+        logf('[actions:%s]: %s' if self.desc else None, self.queued, self.desc, end=' ... ')
+        if self.queued:
+            try:
+                self.chain.perform()
+            finally:
+                self.reset()
+            self.browser._invalidate_page_cache()
+            self.browser._settle(self.sleep)
+        logf('done' if self.desc else None)
+
+    def reset(self):
+        # releases keys and buttons still held in the browser; reset_actions of selenium 3 keeps the
+        # local w3c queue, so the queue starts over on a new chain
+        self.chain.reset_actions()
+        self.chain = ActionChains(self.browser.driver)
+        self.queued = []
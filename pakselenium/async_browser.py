@@ -0,0 +1,165 @@
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+
+from pakselenium.browser import Browser, Settings
+
+
+def _threaded(name: str):
+    async def method(self: 'AsyncBrowser', *args, **kwargs):
+        return await self.run(getattr(self.browser, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = getattr(Browser, name).__doc__
+    return method
+
+
+def _threaded_then_sleep(name: str):
+    # the trailing sleep of these methods is awaited on the event loop instead of blocking the thread
+    default = inspect.signature(getattr(Browser, name)).parameters['sleep'].default
+
+    async def method(self: 'AsyncBrowser', *args, sleep: float = default, **kwargs):
+        result = await self.run(getattr(self.browser, name), *args, sleep=0, **kwargs)
+        await self._settle(sleep)
+        return result
+
+    method.__name__ = name
+    method.__doc__ = getattr(Browser, name).__doc__
+    return method
+
+
+def _threaded_iter(name: str):
+    # the generator runs on the thread of the browser, one batch per next()
+    async def method(self: 'AsyncBrowser', *args, **kwargs):
+        iterator = await self.run(getattr(self.browser, name), *args, **kwargs)
+        done = object()
+        while 1:
+            batch = await self.run(next, iterator, done)
+            if batch is done:
+                return
+            yield batch
+
+    method.__name__ = name
+    method.__doc__ = getattr(Browser, name).__doc__
+    return method
+
+
+class AsyncBrowser(object):
+    browser: Browser
+
+    def __init__(self, browser: Browser = None, settings: Settings = None):
+        assert browser is None or settings is None
+        self.browser = Browser(settings) if browser is None else browser
+        # a webdriver session is not thread-safe, so all calls of one browser share one thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def settings(self) -> Settings:
+        return self.browser.settings
+
+    @property
+    def driver(self):
+        return self.browser.driver
+
+    async def run(self, func: Callable, *args, **kwargs):
+        # runs any blocking call (e.g. PageElement.text) on the thread of this browser
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _settle(self, sleep: float):
+        if sleep <= 0:
+            return
+        if self.settings.settle:
+            await self.run(self.browser.settle, sleep)
+        else:
+            await asyncio.sleep(sleep)
+
+    async def current_url(self) -> str:
+        return await self.run(lambda: self.browser.current_url)
+
+    async def close(self):
+        await self.run(self.browser.close)
+        self._executor.shutdown(wait=False)
+
+    init_chrome = _threaded('init_chrome')
+    init_firefox = _threaded('init_firefox')
+    init_phantomJS = _threaded('init_phantomJS')
+    new_session = _threaded('new_session')
+    quit = _threaded('quit')
+    recycle = _threaded('recycle')
+    is_alive = _threaded('is_alive')
+    execute_cdp = _threaded('execute_cdp')
+    use_load_profile = _threaded('use_load_profile')
+    settle = _threaded('settle')
+    wait_network_idle = _threaded('wait_network_idle')
+
+    # Tab and Actions are used through run(), e.g. await browser.run(tab.go, url)
+    new_tab = _threaded('new_tab')
+    current_tab = _threaded('current_tab')
+    switch_to = _threaded('switch_to')
+    actions = _threaded('actions')
+
+    is_on_page = _threaded('is_on_page')
+    find_element = _threaded('find_element')
+    find_elements = _threaded('find_elements')
+    find_elements_batched = _threaded('find_elements_batched')
+    find_elements_with_text = _threaded('find_elements_with_text')
+    find_elements_contains = _threaded('find_elements_contains')
+    find_elements_matching = _threaded('find_elements_matching')
+    text_index = _threaded('text_index')
+    snapshot = _threaded('snapshot')
+    find_element_from = _threaded('find_element_from')
+    find_elements_from = _threaded('find_elements_from')
+    find_element_with_text_from = _threaded('find_element_with_text_from')
+    get_page_element = _threaded('get_page_element')
+
+    wait_for_dom = _threaded('wait_for_dom')
+    wait_until_on_page = _threaded('wait_until_on_page')
+    wait_until_not_on_page = _threaded('wait_until_not_on_page')
+    wait_until_selector = _threaded('wait_until_selector')
+    wait_until_not_selector = _threaded('wait_until_not_selector')
+    wait_until_page_element = _threaded('wait_until_page_element')
+    wait_until_not_page_element = _threaded('wait_until_not_page_element')
+    wait_until_clickable = _threaded('wait_until_clickable')
+    wait_until = _threaded('wait_until')
+    wait_until_not = _threaded('wait_until_not')
+    is_reached_page = _threaded('is_reached_page')
+    check_conditions = _threaded('check_conditions')
+
+    condition_text_is_in = _threaded('condition_text_is_in')
+    condition_text_not_in = _threaded('condition_text_not_in')
+    condition_text_equal = _threaded('condition_text_equal')
+    condition_text_not_equal = _threaded('condition_text_not_equal')
+
+    go = _threaded('go')
+    click = _threaded('click')
+    refresh = _threaded('refresh')
+    get_cookies = _threaded('get_cookies')
+    set_cookies = _threaded('set_cookies')
+    save_session = _threaded('save_session')
+    restore_session = _threaded('restore_session')
+
+    iter_pages = _threaded_iter('iter_pages')
+    iter_scroll = _threaded_iter('iter_scroll')
+
+    select = _threaded_then_sleep('select')
+    deselect = _threaded_then_sleep('deselect')
+    fill_text = _threaded_then_sleep('fill_text')
+    fill_text_one_by_one = _threaded_then_sleep('fill_text_one_by_one')
+    fill_form = _threaded_then_sleep('fill_form')
+    move_cursor = _threaded_then_sleep('move_cursor')
+    drug_and_drop = _threaded_then_sleep('drug_and_drop')
+
+    press_key = _threaded('press_key')
+    press_Enter = _threaded('press_Enter')
+    press_Backspace = _threaded('press_Backspace')
+    press_Tab = _threaded('press_Tab')
+    press_Esc = _threaded('press_Esc')
@@ -1,35 +1,64 @@
+import itertools
 import random
+import re
 import time
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
 from enum import Enum
 from functools import partial
-from typing import List, Callable, Union, Tuple, Optional
+from typing import List, Callable, Union, Tuple, Optional, Dict, Any, Hashable, Iterator
 
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import InvalidCookieDomainException
+from selenium.common.exceptions import InvalidElementStateException
+from selenium.common.exceptions import JavascriptException
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.common.exceptions import TimeoutException
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import ChromeOptions
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.firefox.firefox_binary import FirefoxBinary
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
 
-from pakselenium import config
-from pakselenium.utils import callable_conditions as CC
+from pakselenium.actions import Actions
+from pakselenium.lifecycle import Lifecycle, check_requirements
+from pakselenium.snapshot import Snapshot
+from pakselenium.tabs import Tab
 from pakselenium.utils import catch
+from pakselenium.utils.conditions import Conditions, Matched
+from pakselenium.utils.dedupe import Seen
 from pakselenium.utils import expected_conditions as EC
+from pakselenium.utils import instrument
+from pakselenium.utils.loading import ANALYTICS, LoadProfile
+# log is re-exported, pakselenium.browser.log was public before utils.logs
+from pakselenium.utils.logs import log, logf
+from pakselenium.utils.network import DATA_TYPES, NetworkTracker
+from pakselenium.utils import scripts
+from pakselenium.utils import service
+from pakselenium.utils import session
+from pakselenium.utils.poll import PollPolicy, PolicyWait
 
 
 class Selector:
+    # equal and hashable by (by, value), desc is only a label
+    __slots__ = ('by', 'value', 'desc')
 
     def __init__(self, by: str, value: str, desc: str = None):
         self.by = by
         self.value = value
         self.desc = desc
 
+    def __eq__(self, other):
+        if not isinstance(other, Selector):
+            return NotImplemented
+        return self.by == other.by and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.by, self.value))
+
     def __repr__(self):
         if self.desc:
             return f"Selector('{self.desc}')"
@@ -43,20 +72,144 @@ class Selector:
 
 class PageElement(object):
     element: WebElement
-    text: str
-
-    def __init__(self, element: WebElement):
+    # a stale element is found again by its selector and index, at most `retries` times;
+    # with element_text the index counts only the elements whose text matches
+    retries: int = 3
+    policy: PollPolicy = PollPolicy.backoff()
+
+    def __init__(self, element: WebElement, text: str = None, attributes: dict = None,
+                 selector: Selector = None, index: int = 0, root: 'PageElement' = None,
+                 element_text: str = None, match: str = 'equal', ignore_case: bool = False):
+        # text and attributes are fetched on first access and memoized until refresh()
         self.element = element
-        self.text = self.element.text.strip()
+        self.selector = selector
+        self.index = index
+        self.root = root
+        self.element_text = element_text
+        self.match = match
+        self.ignore_case = ignore_case
+        self._text = text
+        self._attributes = {} if attributes is None else dict(attributes)
 
     def __repr__(self):
         return f"PageElement('{self.text}')"
 
-    def is_displayed(self):
-        return self.element.is_displayed()
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._call(lambda e: e.text).strip()
+        return self._text
+
+    def refresh(self):
+        self._text = None
+        self._attributes = {}
+
+    def resolve(self) -> bool:
+        # finds the element again where it came from; False when it is gone or the origin is unknown
+        if self.selector is None:
+            return False
+        es = self._locate(None) if self.root is None else self.root._call(self._locate)
+        if self.index >= len(es):
+            return False
+        self.element = es[self.index]
+        self.refresh()
+        return True
+
+    def _locate(self, root: Optional[WebElement]) -> List[WebElement]:
+        driver = self.element.parent
+        if self.element_text is None:
+            return (driver if root is None else root).find_elements(self.selector.by, self.selector.value)
+        found = driver.execute_script(scripts.FIND_ELEMENTS_MATCHING, self.selector.by, self.selector.value, root,
+                                      self.element_text, self.match, self.ignore_case)
+        return [element for element, _ in found]
+
+    def _call(self, func: Callable[[WebElement], Any]):
+        delays = None
+        for attempt in itertools.count():
+            try:
+                return func(self.element)
+            except StaleElementReferenceException:
+                if attempt >= self.retries:
+                    raise
+                # the first re-resolution is immediate, a re-render is usually over by then
+                if attempt:
+                    delays = delays or self.policy.intervals()
+                    instrument.sleep(next(delays))
+                logf('[PageElement]: stale, resolving %s[%s]', self.selector, self.index, min_verbose=1)
+                instrument.record_retry()
+                if not self.resolve():
+                    raise
+
+    def is_displayed(self) -> bool:
+        return self._call(lambda e: e.is_displayed())
+
+    def is_enabled(self) -> bool:
+        return self._call(lambda e: e.is_enabled())
+
+    def is_selected(self) -> bool:
+        return self._call(lambda e: e.is_selected())
 
     def get_attribute(self, name: str):
-        return self.element.get_attribute(name)
+        if name not in self._attributes:
+            self._attributes[name] = self._call(lambda e: e.get_attribute(name))
+        return self._attributes[name]
+
+    def click(self):
+        self._call(lambda e: e.click())
+
+    def clear(self):
+        self._call(lambda e: e.clear())
+
+    def send_keys(self, *value):
+        self._call(lambda e: e.send_keys(*value))
+
+    @staticmethod
+    def prefetch(pes: List['PageElement'], attributes: List[str] = None) -> List['PageElement']:
+        # fills text and attributes of all elements with one execute_script call
+        if not pes:
+            return pes
+        driver = pes[0].element.parent
+        found = driver.execute_script(scripts.PREFETCH, [pe.element for pe in pes], attributes or [])
+        for pe, (text, attrs) in zip(pes, found):
+            pe._text = text
+            pe._attributes.update(attrs)
+        return pes
+
+
+class TextIndex(object):
+    # text -> elements of one lookup, for repeated text matching without WebDriver traffic
+
+    def __init__(self, pes: List[PageElement]):
+        self.pes = pes
+        self._equal: Dict[str, List[PageElement]] = defaultdict(list)
+        self._equal_lower: Dict[str, List[PageElement]] = defaultdict(list)
+        for pe in pes:
+            self._equal[pe.text].append(pe)
+            self._equal_lower[pe.text.lower()].append(pe)
+
+    def __len__(self):
+        return len(self.pes)
+
+    def equal(self, text: str, ignore_case: bool = False) -> List[PageElement]:
+        if ignore_case:
+            return list(self._equal_lower.get(text.lower(), []))
+        return list(self._equal.get(text, []))
+
+    def contains(self, text: str, ignore_case: bool = False) -> List[PageElement]:
+        if ignore_case:
+            text = text.lower()
+            return [pe for key, pes in self._equal_lower.items() if text in key for pe in pes]
+        return [pe for key, pes in self._equal.items() if text in key for pe in pes]
+
+    def regex(self, pattern: str, flags: int = 0) -> List[PageElement]:
+        regex = re.compile(pattern, flags)
+        return [pe for key, pes in self._equal.items() if regex.search(key) for pe in pes]
+
+
+class Match(Enum):
+    equal = 'equal'
+    contains = 'contains'
+    regex = 'regex'
 
 
 class Names(Enum):
@@ -71,50 +224,105 @@ class Settings(object):
     driver_kwargs: dict = None
     timeout_wait: int = 20
     implicit_wait: int = 0
+    # the driver's script timeout, async scripts raise it for one call and set it back to this
+    script_timeout: float = 30
     url: str = ''
-
-
-def log(msg: Optional[str], min_verbose: int = 2, end=None):
-    if msg and config.debug_verbose >= min_verbose:
-        print(msg, end=end)
-
-
+    observe_dom: bool = False
+    poll_policy: PollPolicy = field(default_factory=PollPolicy)
+    settle: bool = False
+    settle_quiet: float = 0.1
+    load_profile: LoadProfile = None
+    # chrome only: Browser.network counts in-flight requests of these types from the performance log
+    track_network: bool = False
+    network_types: Tuple[str, ...] = DATA_TYPES
+    network_ignore: List[str] = field(default_factory=lambda: list(ANALYTICS))
+    # chrome only: sessions are opened on one chromedriver per process, spare_sessions are opened in advance
+    shared_service: bool = False
+    spare_sessions: int = 0
+    # go() recycles the session after recycle_pages pages or when the browser processes use recycle_rss MB,
+    # checked every rss_check_every pages (needs psutil)
+    recycle_pages: int = None
+    recycle_rss: int = None
+    rss_check_every: int = 10
+
+
+def _get_text(pe: PageElement) -> str:
+    return pe.text
+
+
+def _is_replaced(driver: webdriver.Remote, element: WebElement, text: str) -> bool:
+    # text was read by the in-page text() of the batched scripts, so it is compared with the same,
+    # WebElement.text normalizes whitespace differently
+    try:
+        return driver.execute_script(scripts.PREFETCH, [element], [])[0][0] != text
+    except StaleElementReferenceException:
+        return True
+
+
+@instrument.instrument_methods
 class Browser(object):
     driver: webdriver.Chrome
-    driver_wait: WebDriverWait
-    driver_actions: ActionChains
+    driver_wait: PolicyWait
     wait_page_loading: bool = True
     stop_page_loading: Callable
-
-    def __init__(self):
-        self.settings = Settings()
+    network: Optional[NetworkTracker] = None
+    lifecycle: Optional[Lifecycle] = None
+
+    def __init__(self, settings: Settings = None):
+        self.settings = Settings() if settings is None else settings
+        self.driver = None
+        self._text_indexes: Dict[Tuple[str, str], TextIndex] = {}
+        self._handles: Dict[Tuple[Selector, Optional[str], int], PageElement] = {}
+        self._handles_url: Optional[str] = None
+        self._load_profile: Optional[LoadProfile] = None
+        self._handle: Optional[str] = None
+        self._tabs: Dict[str, Tab] = {}
+        self._page_caches: Dict[str, tuple] = {}
+        self._tracks_requests = False
 
     def init_chrome(self,
                     driver_path: str,
                     options: ChromeOptions = None,
                     wait_page_loading=True,
+                    profile_dir: str = None,
                     **kwargs):
+        check_requirements(self.settings.recycle_rss, self.settings.shared_service)
         self.settings.driver_name = Names.chrome.value
         self.settings.driver_kwargs = dict(driver_path=driver_path, options=options,
-                                           wait_page_loading=wait_page_loading, **kwargs)
+                                           wait_page_loading=wait_page_loading, profile_dir=profile_dir, **kwargs)
         self.wait_page_loading = wait_page_loading
+        if profile_dir is not None:
+            # a reused profile directory keeps cookies, storage and cache between sessions
+            options = ChromeOptions() if options is None else options
+            if f'--user-data-dir={profile_dir}' not in options.arguments:
+                options.add_argument(f'--user-data-dir={profile_dir}')
         self.stop_page_loading = lambda: self.driver.execute_script("window.stop();")
+        capa = None
+        if not wait_page_loading or self.settings.track_network:
+            capa = DesiredCapabilities.CHROME.copy()
         if not wait_page_loading:
-            capa = DesiredCapabilities.CHROME
             capa['pageLoadStrategy'] = 'none'
+        if self.settings.track_network:
+            capa['goog:loggingPrefs'] = {'performance': 'ALL'}
+
+        tt = time.perf_counter()
+        if self.settings.shared_service:
+            # a profile directory can be open in one session only, so it gets no spares
+            spares = 0 if profile_dir is not None else self.settings.spare_sessions
+            self.driver = service.chrome_session(driver_path, options, capa, spares=spares, **kwargs)
         else:
-            capa = None
-
-        self.driver = webdriver.Chrome(executable_path=driver_path,
-                                       options=options,
-                                       desired_capabilities=capa,
-                                       **kwargs)
+            self.driver = webdriver.Chrome(executable_path=driver_path,
+                                           options=options,
+                                           desired_capabilities=capa,
+                                           **kwargs)
         self.init_after_browser()
+        logf('[init_chrome]: ready in %.3fs', time.perf_counter() - tt, min_verbose=1)
 
     def init_firefox(self,
                      driver_path: str,
                      binary_path: str,
                      **kwargs):
+        check_requirements(self.settings.recycle_rss)
         self.settings.driver_name = Names.firefox.value
         self.settings.driver_kwargs = dict(driver_path=driver_path, binary_path=binary_path, **kwargs)
         self.driver = webdriver.Firefox(executable_path=driver_path,
@@ -125,20 +333,46 @@ class Browser(object):
     def init_phantomJS(self,
                        driver_path: str,
                        **kwargs):
+        check_requirements(self.settings.recycle_rss)
         self.settings.driver_name = Names.phantomJS.value
         self.settings.driver_kwargs = dict(driver_path=driver_path, **kwargs)
         self.driver = webdriver.PhantomJS(executable_path=driver_path, **kwargs)
         self.init_after_browser()
 
     def init_after_browser(self):
+        instrument.count_round_trips(self.driver)
         self.driver.implicitly_wait(self.settings.implicit_wait)
-        self.driver_wait = WebDriverWait(self.driver, self.settings.timeout_wait)
-        self.driver_actions = ActionChains(self.driver)
-        time.sleep(1.0)
+        self.driver_wait = PolicyWait(self.driver, self.settings.timeout_wait, self.settings.poll_policy)
+        self._load_profile = None
+        self._handle = None
+        self._tabs = {}
+        self._page_caches = {}
+        self._tracks_requests = False
+        self.lifecycle = Lifecycle(self, self.settings.recycle_pages, self.settings.recycle_rss,
+                                   self.settings.rss_check_every)
+        if self.settings.track_network:
+            self.network = NetworkTracker(self.driver, self.settings.network_types, self.settings.network_ignore)
+        if self.settings.load_profile is not None:
+            self.use_load_profile(self.settings.load_profile)
+        self._wait_ready(1.0)
+
+    def _wait_ready(self, timeout: float) -> bool:
+        # a new session is usable once its blank page answers scripts, no need to sleep for timeout
+        tt = time.time()
+        while 1:
+            try:
+                if self.driver.execute_script(scripts.READY_STATE) == 'complete':
+                    return True
+            except WebDriverException:
+                pass
+            if time.time() - tt >= timeout:
+                return False
+            instrument.sleep(0.05)
 
     def new_session(self):
         assert self.settings.driver_name
-        self.close()
+        self.quit()
+        self._invalidate_page_cache()
         if self.settings.driver_name == Names.chrome.value:
             self.init_chrome(**self.settings.driver_kwargs)
         elif self.settings.driver_name == Names.firefox.value:
@@ -148,105 +382,385 @@ class Browser(object):
         else:
             raise StopIteration(self.settings.driver_name)
 
+    def quit(self):
+        # ends the session and waits for the browser processes, leftovers are killed (with psutil)
+        if self.driver is None:
+            return
+        if self.lifecycle is not None and self.lifecycle.driver is self.driver:
+            self.lifecycle.quit()
+        else:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+        self.driver = None
+        self.lifecycle = None
+        self.network = None
+
     def close(self):
+        self.quit()
+
+    def recycle(self, desc: str = None):
+        # a fresh session in place of a long-running one, cookies of all domains are kept;
+        # other tabs, storage and the current page are not, a Tab of the only window moves to the new one
+        logf('[recycle]: %s' if desc else None, desc, end=' ... ')
+        tabs = self.tabs
+        if self.supports_cdp:
+            cookies = session.from_cdp_cookies(self.execute_cdp('Network.getAllCookies')['cookies'])
+            self.new_session()
+            self.execute_cdp('Network.setCookies', {'cookies': session.to_cdp_cookies(cookies)})
+        else:
+            # without cdp, cookies can only be set on a page of their domain
+            url, cookies = self.driver.current_url, self.driver.get_cookies()
+            self.new_session()
+            if cookies:
+                self.driver.get(url)
+                for cookie in cookies:
+                    cookie.pop('expiry', None)
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except InvalidCookieDomainException:
+                        logf('[recycle]: skipped cookie of %s' if desc else None, cookie.get('domain'))
+        if len(tabs) == 1:
+            tab, = tabs
+            tab.handle = self.driver.current_window_handle
+            self._tabs[tab.handle] = tab
+        logf('done' if desc else None)
+
+    @property
+    def tabs(self) -> List[Tab]:
+        return list(self._tabs.values())
+
+    def new_tab(self, url: str = None, desc: str = None) -> Tab:
+        # tabs share the driver process, so they cost far less memory than more browsers
+        logf('[new_tab]: %s' if desc else None, desc)
+        handles = set(self.driver.window_handles)
+        self.driver.execute_script(scripts.NEW_TAB)
+        handle = next(i for i in self.driver.window_handles if i not in handles)
+        tab = self._tabs[handle] = Tab(self, handle)
+        if url is not None:
+            tab.open(url)
+        return tab
+
+    def current_tab(self) -> Tab:
+        self._handle = self.driver.current_window_handle
+        if self._handle not in self._tabs:
+            self._tabs[self._handle] = Tab(self, self._handle)
+        return self._tabs[self._handle]
+
+    def switch_to(self, handle: str):
+        # the active handle is remembered, switching to it again costs no round trip
+        if self._handle is None:
+            # the window the session started in keeps its page caches as well
+            self._handle = self.driver.current_window_handle
+        self._switch(handle)
+
+    def _switch(self, handle: str):
+        if handle == self._handle:
+            return
+        if self._handle is not None:
+            self._page_caches[self._handle] = (self._text_indexes, self._handles, self._handles_url)
+        self.driver.switch_to.window(handle)
+        self._handle = handle
+        if handle in self._page_caches:
+            self._text_indexes, self._handles, self._handles_url = self._page_caches.pop(handle)
+        else:
+            self._invalidate_page_cache()
+
+    def _forget_tab(self, handle: str):
+        self._tabs.pop(handle, None)
+        self._page_caches.pop(handle, None)
+        if self._handle == handle:
+            self._handle = None
+            self._invalidate_page_cache()
+            # after a close the driver has no current window, the first remaining one becomes current
+            handles = self.driver.window_handles
+            if handles:
+                self._switch(handles[0])
+
+    def execute_cdp(self, cmd: str, params: dict = None):
+        # Chrome DevTools Protocol command through chromedriver, chrome only
+        return self.driver.execute('executeCdpCommand', {'cmd': cmd, 'params': params or {}})['value']
+
+    def use_load_profile(self, profile: Optional[LoadProfile], desc: str = None):
+        # blocks resources by url pattern, a no-op if the profile is already active
+        profile = LoadProfile() if profile is None else profile
+        if profile == self._load_profile:
+            return
+        logf('[use_load_profile]: %s: %s' if desc else None, desc, profile)
+        if self._load_profile is None:
+            self.execute_cdp('Network.enable')
+        self.execute_cdp('Network.setBlockedURLs', {'urls': profile.blocked_urls})
+        self._load_profile = profile
+
+    @instrument.waits
+    def settle(self, timeout: float, quiet: float = None, desc: str = None) -> bool:
+        # returns as soon as the page is loaded, has no pending fetch/XHR and the DOM stays quiet
+        logf('[settle]: %s' if desc else None, desc, end=' ... ')
+        self._track_requests()
+        quiet = self.settings.settle_quiet if quiet is None else quiet
+        tt = time.time()
+        settled = False
+        while not settled and time.time() - tt < timeout:
+            left = timeout - (time.time() - tt)
+            try:
+                settled = bool(self._execute_async_script(left, scripts.SETTLE, int(quiet * 1000), int(left * 1000)))
+            except JavascriptException:
+                # document was replaced while settling, start over on the new one
+                continue
+        logf('[%s]' if desc else None, settled)
+        return settled
+
+    @instrument.waits
+    def wait_network_idle(self, idle: int = 500, timeout: float = None, desc: str = None) -> bool:
+        # idle in milliseconds, like go(until_network_idle=...): no tracked request in flight, started or
+        # finished for that long; False on timeout
+        assert self.network is not None, 'network tracking needs Settings(track_network=True)'
+        logf('[wait_network_idle]: %s' if desc else None, desc, end=' ... ')
+        timeout = self.settings.timeout_wait if timeout is None else timeout
+        tt = time.time()
+        delays = self.settings.poll_policy.intervals()
+        while not self.network.is_idle(idle / 1000):
+            if time.time() - tt >= timeout:
+                logf('[False] %s' if desc else None, self.network)
+                return False
+            instrument.sleep(min(next(delays), idle / 1000))
+        logf('[True]' if desc else None)
+        return True
+
+    def _track_requests(self):
+        # SETTLE installs the request tracker only when it first runs on a document, missing the requests
+        # started during load; chrome runs it on every new document before the page scripts instead
+        if self.supports_cdp and not self._tracks_requests:
+            self.execute_cdp('Page.addScriptToEvaluateOnNewDocument', {'source': scripts.REQUEST_TRACKER})
+            self._tracks_requests = True
+
+    def _settle(self, sleep: float):
+        # in settle mode a fixed sleep is only the upper bound of waiting for readiness
+        if self.settings.settle and sleep > 0:
+            self.settle(sleep)
+        else:
+            instrument.sleep(sleep)
+
+    def is_alive(self) -> bool:
+        if self.driver is None:
+            return False
         try:
-            self.driver.close()
-        except WebDriverException:
-            pass
+            self.driver.window_handles
+            return True
+        except Exception:
+            # dead session or the driver process is gone
+            return False
 
     def is_on_page(self, selector: Selector, desc: str = None) -> bool:
-        log(f'[is_on_page]: {desc}: {selector.desc}' if desc else None, end=' ... ')
+        logf('[is_on_page]: %s: %s' if desc else None, desc, selector.desc, end=' ... ')
         try:
             self.driver.find_element(selector.by, selector.value)
-            log(f'[True]' if desc else None)
+            logf('[True]' if desc else None)
             return True
         except NoSuchElementException:
-            log(f'[False]' if desc else None)
+            logf('[False]' if desc else None)
             return False
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_element(self, selector: Selector, desc: str = None) -> PageElement:
-        log(f'[find_element]: {desc}: {selector.desc}' if desc else None, end=' ... ')
-        if not self.is_on_page(selector):
-            raise NoSuchElementException
+        logf('[find_element]: %s: %s' if desc else None, desc, selector.desc, end=' ... ')
         element = self.driver.find_element(selector.by, selector.value)
-        pe = PageElement(element)
-        log(f'found {pe}' if desc else None)
+        pe = PageElement(element, selector=selector)
+        logf('found %s' if desc else None, pe)
         return pe
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_elements(self, selector: Selector, desc: str = None) -> List[PageElement]:
-        log(f'[find_elements]: {desc}: {selector.desc}' if desc else None, end=' ... ')
-        if not self.is_on_page(selector):
-            raise NoSuchElementException
+        logf('[find_elements]: %s: %s' if desc else None, desc, selector.desc, end=' ... ')
         es = self.driver.find_elements(selector.by, selector.value)
+        if not es:
+            raise NoSuchElementException
         pes = []
-        for element in es:
-            pes.append(PageElement(element))
-        log(f'found {pes}' if desc else None)
+        for i, element in enumerate(es):
+            pes.append(PageElement(element, selector=selector, index=i))
+        logf('found %s' if desc else None, pes)
         return pes
 
-    @catch.staleElementReferenceException()
-    def find_elements_with_text(self, selector: Selector, element_text: str, desc: str = None) -> List[PageElement]:
-        log(f'[find_elements_with_text]: {desc}: {selector.desc} with "{element_text}"' if desc else None, end=' ... ')
-        pe = self.find_elements(selector)
-        es = [i for i in pe if i.text == element_text]
-        if not es:
+    @catch.staleElementReferenceException(sleep=None, retries=3)
+    def find_elements_batched(self, selector: Selector, attributes: List[str] = None,
+                              from_pe: PageElement = None, desc: str = None) -> List[PageElement]:
+        # one execute_script call returns the elements together with their text and attributes
+        logf('[find_elements_batched]: %s: %s' if desc else None, desc, selector.desc, end=' ... ')
+        root = None if from_pe is None else from_pe.element
+        found = self.driver.execute_script(scripts.FIND_ELEMENTS, selector.by, selector.value,
+                                           root, attributes or [])
+        if not found and from_pe is None:
             raise NoSuchElementException
-        log(f'found {es}' if desc else None)
+        pes = [PageElement(element, text=text, attributes=attrs, selector=selector, index=i, root=from_pe)
+               for i, (element, text, attrs) in enumerate(found)]
+        logf('found %s' if desc else None, pes)
+        return pes
+
+    @catch.staleElementReferenceException(sleep=None, retries=3)
+    def find_elements_with_text(self, selector: Selector, element_text: str, desc: str = None) -> List[PageElement]:
+        logf('[find_elements_with_text]: %s: %s with "%s"' if desc else None, desc, selector.desc, element_text,
+            end=' ... ')
+        es = self.find_elements_matching(selector, element_text, match=Match.equal.value)
+        logf('found %s' if desc else None, es)
         return es
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_elements_contains(self, selector: Selector, element_text: str, desc: str = None) -> List[PageElement]:
-        log(f'[find_elements_contains]: {desc}: {selector.desc} contains "{element_text}"' if desc else None,
+        logf('[find_elements_contains]: %s: %s contains "%s"' if desc else None, desc, selector.desc, element_text,
             end=' ... ')
-        pe = self.find_elements(selector)
-        es = [i for i in pe if element_text in i.text]
-        if not es:
-            raise NoSuchElementException
-        log(f'found {es}' if desc else None)
+        es = self.find_elements_matching(selector, element_text, match=Match.contains.value)
+        logf('found %s' if desc else None, es)
         return es
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
+    def find_elements_matching(self, selector: Selector, text: str, match: str = Match.equal.value,
+                               ignore_case: bool = False, from_pe: PageElement = None,
+                               desc: str = None) -> List[PageElement]:
+        # text is filtered in-page by one script; regex uses JavaScript RegExp syntax
+        logf('[find_elements_matching]: %s: %s %s "%s"' if desc else None, desc, selector.desc, match, text,
+            end=' ... ')
+        root = None if from_pe is None else from_pe.element
+        found = self.driver.execute_script(scripts.FIND_ELEMENTS_MATCHING, selector.by, selector.value, root,
+                                           text, match, ignore_case)
+        if not found:
+            raise NoSuchElementException
+        pes = [PageElement(element, text=element_text, selector=selector, index=i, root=from_pe,
+                           element_text=text, match=match, ignore_case=ignore_case)
+               for i, (element, element_text) in enumerate(found)]
+        logf('found %s' if desc else None, pes)
+        return pes
+
+    def text_index(self, selector: Selector, desc: str = None) -> TextIndex:
+        # built from one batched lookup and kept until the page changes
+        index = self._text_indexes.get(selector.locator)
+        if index is None:
+            logf('[text_index]: %s: %s' if desc else None, desc, selector.desc)
+            pes = self.find_elements_batched(selector) if self.is_on_page(selector) else []
+            index = self._text_indexes[selector.locator] = TextIndex(pes)
+        return index
+
+    def _invalidate_page_cache(self):
+        # text indexes and element handles belong to one document
+        self._text_indexes = {}
+        self._handles = {}
+        self._handles_url = None
+
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_element_from(self, from_pe: PageElement, selector: Selector, desc: str = None) -> PageElement:
-        log(f'[find_element_from]: {desc}: {selector.desc} from {from_pe.text}' if desc else None, end=' ... ')
-        element = from_pe.element.find_element(selector.by, selector.value)
-        pe = PageElement(element)
-        log(f'found {pe}' if desc else None)
+        logf('[find_element_from]: %s: %s from %s' if desc else None, desc, selector.desc, from_pe, end=' ... ')
+        element = from_pe._call(lambda e: e.find_element(selector.by, selector.value))
+        pe = PageElement(element, selector=selector, root=from_pe)
+        logf('found %s' if desc else None, pe)
         return pe
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_elements_from(self, from_pe: PageElement, selector: Selector, desc: str = None) -> List[PageElement]:
-        log(f'[find_elements_from]: {desc}: {selector.desc} from {from_pe.text}' if desc else None, end=' ... ')
-        es = from_pe.element.find_elements(selector.by, selector.value)
+        logf('[find_elements_from]: %s: %s from %s' if desc else None, desc, selector.desc, from_pe, end=' ... ')
+        es = from_pe._call(lambda e: e.find_elements(selector.by, selector.value))
         pes = []
-        for element in es:
-            pes.append(PageElement(element))
-        log(f'found {pes}' if desc else None)
+        for i, element in enumerate(es):
+            pes.append(PageElement(element, selector=selector, index=i, root=from_pe))
+        logf('found %s' if desc else None, pes)
         return pes
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def find_element_with_text_from(self, from_pe: PageElement, selector: Selector, text: str,
                                     desc: str = None) -> PageElement:
-        log(f'[find_elements_from]: {desc}: {selector.desc} from {from_pe.text}' if desc else None, end=' ... ')
-        pe = self.find_elements_from(from_pe, selector)
-        pes = [i for i in pe if i.text == text]
-        if not pes:
-            raise NoSuchElementException
-        log(f'found {pes}' if desc else None)
+        logf('[find_elements_from]: %s: %s from %s' if desc else None, desc, selector.desc, from_pe, end=' ... ')
+        pes = self.find_elements_matching(selector, text, match=Match.equal.value, from_pe=from_pe)
+        logf('found %s' if desc else None, pes)
         return pes[0]
 
+    def snapshot(self, desc: str = None) -> Snapshot:
+        # one page_source round trip, then Selector queries run locally on the parsed tree
+        logf('[snapshot]: %s' if desc else None, desc)
+        return Snapshot(self.driver.page_source, lambda xpath: self.find_element(Selector(By.XPATH, xpath)))
+
+    def iter_pages(self, item: Selector, next_page: Selector, extract: Callable[[PageElement], Any] = None,
+                   attributes: List[str] = None, key: Callable[[Any], Hashable] = None, max_pages: int = None,
+                   remember: int = 100000, sleep: float = 0.5, timeout: int = None,
+                   desc: str = None) -> Iterator[list]:
+        # yields the records of each page not yielded before, then clicks next_page; ends when next_page
+        # is gone or disabled, when a click does not change the items or when a page brings no new records.
+        # extract gets PageElements with text and attributes prefetched, the default extracts the text.
+        extract = _get_text if extract is None else extract
+        seen = Seen(remember, key)
+        for page in itertools.count(1):
+            try:
+                pes = self.find_elements_batched(item, attributes)
+            except NoSuchElementException:
+                pes = []
+            records = seen.new(extract(pe) for pe in pes)
+            logf('[iter_pages:%s]: %s: %s new records' if desc else None, page, desc, len(records))
+            if not records:
+                return
+            yield records
+            if max_pages is not None and page >= max_pages:
+                return
+            if not self._next_page(next_page, pes[0], sleep, timeout):
+                return
+
+    def _next_page(self, next_page: Selector, first: PageElement, sleep: float, timeout: int = None) -> bool:
+        try:
+            pe = self.get_page_element(next_page)
+            if not (pe.is_displayed() and pe.is_enabled()) or pe.get_attribute('aria-disabled') == 'true':
+                return False
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+        pe.click()
+        self._settle(sleep)
+        try:
+            # the first item is replaced or changes its text, whether the page reloads or re-renders
+            self.wait_until(lambda: _is_replaced(self.driver, first.element, first.text), timeout=timeout)
+        except TimeoutException:
+            return False
+        self._invalidate_page_cache()
+        return True
+
+    def iter_scroll(self, item: Selector, extract: Callable[[PageElement], Any] = None,
+                    attributes: List[str] = None, key: Callable[[Any], Hashable] = None, max_scrolls: int = None,
+                    remember: int = 100000, idle: float = 5.0, desc: str = None) -> Iterator[list]:
+        # scrolls the last item into view and yields the records of the items that appeared since;
+        # ends when the number of items does not change for idle seconds
+        extract = _get_text if extract is None else extract
+        seen = Seen(remember, key)
+        offset = 0
+        for scroll in itertools.count(1):
+            found = self.driver.execute_script(scripts.SCROLL_ITEMS, item.by, item.value, offset, attributes or [])
+            pes = [PageElement(element, text=text, attributes=attrs, selector=item, index=found['offset'] + i)
+                   for i, (element, text, attrs) in enumerate(found['items'])]
+            records = seen.new(extract(pe) for pe in pes)
+            logf('[iter_scroll:%s]: %s: %s new records' if desc else None, scroll, desc, len(records))
+            if records:
+                yield records
+            if max_scrolls is not None and scroll >= max_scrolls:
+                return
+            offset = total = found['total']
+            try:
+                self.wait_until(lambda: self.driver.execute_script(scripts.COUNT_ELEMENTS, item.by, item.value)
+                                != total, timeout=idle)
+            except TimeoutException:
+                return
+
     def get_page_element(self, selector: Union[Selector, PageElement], element_text: str = None,
-                         element_index: int = None, desc: str = None) -> PageElement:
+                         element_index: int = None, desc: str = None, cached: bool = True) -> PageElement:
         if isinstance(selector, Selector):
+            # handles are cached until the document changes; a stale one is found again by its selector
             element_index = 0 if element_index is None else element_index
+            key = (selector, element_text or None, element_index)
+            pe = self._handles.get(key) if cached else None
+            if pe is not None:
+                logf('[get_page_element]: %s: %s cached' if desc else None, desc, selector.desc)
+                return pe
             if element_text:
-                return self.find_elements_with_text(selector, element_text, desc=desc)[element_index]
+                pe = self.find_elements_with_text(selector, element_text, desc=desc)[element_index]
+            elif element_index == 0:
+                pe = self.find_element(selector, desc=desc)
             else:
-                if element_index == 0:
-                    return self.find_element(selector, desc=desc)
-                else:
-                    return self.find_elements(selector, desc=desc)[element_index]
+                pe = self.find_elements(selector, desc=desc)[element_index]
+            self._handles[key] = pe
+            return pe
         elif isinstance(selector, PageElement):
             assert element_text is None
             assert element_index is None
@@ -254,14 +768,68 @@ class Browser(object):
         else:
             raise StopIteration
 
+    def _forget_handle(self, selector: Selector, element_text: str = None, element_index: int = None):
+        self._handles.pop((selector, element_text or None, 0 if element_index is None else element_index), None)
+
     def get_is_on_page_callable(self, selector: Selector, desc: str = None) -> Callable:
         return lambda: self.is_on_page(selector, desc=desc)
 
     def get_is_not_on_page_callable(self, selector: Selector, desc: str = None) -> Callable:
         return lambda: not self.is_on_page(selector, desc=desc)
 
+    @instrument.waits
+    def wait_for_dom(self, until: Union[Selector, List[Selector]] = None,
+                     until_lost: Union[Selector, List[Selector]] = None,
+                     desc: str = None, timeout: float = None) -> bool:
+        # blocks on one async script with a MutationObserver instead of polling find_element
+        logf('[wait_for_dom]: %s' if desc else None, desc, end=' ... ')
+        timeout = self.settings.timeout_wait if timeout is None else timeout
+        until = [until] if isinstance(until, Selector) else until or []
+        until_lost = [until_lost] if isinstance(until_lost, Selector) else until_lost or []
+        conditions = [[i.by, i.value, True] for i in until] + [[i.by, i.value, False] for i in until_lost]
+        tt, left = time.time(), timeout
+        while 1:
+            try:
+                reached = bool(self._execute_async_script(left, scripts.WAIT_FOR_DOM, conditions, int(left * 1000)))
+                break
+            except JavascriptException:
+                # document was unloaded by a navigation while waiting, wait on the new one for the time left
+                left = timeout - (time.time() - tt)
+                if left <= 0:
+                    reached = False
+                    break
+        logf('[%s]' if desc else None, reached)
+        return reached
+
+    def _execute_async_script(self, timeout: float, script: str, *args):
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.driver.set_script_timeout(self.settings.script_timeout)
+
+    @staticmethod
+    def _get_observed_selectors(until, until_lost) -> Optional[Tuple[List[Selector], List[Selector]]]:
+        # returns (until, until_lost) if both can be watched in-page, None if callables are involved
+        if (until is None and until_lost is None) or callable(until):
+            return None
+        until = [until] if isinstance(until, Selector) else until or []
+        until_lost = [until_lost] if isinstance(until_lost, Selector) else until_lost or []
+        if all(isinstance(i, Selector) for i in until + until_lost):
+            return until, until_lost
+        return None
+
+    def _wait_for_dom_or_timeout(self, until, until_lost, forever: bool, desc: str, timeout: int):
+        timeout = self.settings.timeout_wait if timeout is None else timeout
+        while not self.wait_for_dom(until, until_lost, desc=desc, timeout=timeout):
+            logf('[wait_for_dom]: %s caught TimeoutException', desc, min_verbose=1)
+            if not forever:
+                raise TimeoutException
+
     def wait_until_on_page(self, selector: Union[Selector, List[Selector]],
                            forever: bool = False, desc: str = None, timeout: int = None):
+        if self.settings.observe_dom:
+            return self._wait_for_dom_or_timeout(selector, None, forever, desc, timeout)
         if isinstance(selector, Selector):
             func = self.get_is_on_page_callable(selector, desc=desc)
         else:
@@ -270,6 +838,8 @@ class Browser(object):
 
     def wait_until_not_on_page(self, selector: Union[Selector, List[Selector]],
                                forever: bool = False, desc: str = None, timeout: int = None):
+        if self.settings.observe_dom:
+            return self._wait_for_dom_or_timeout(None, selector, forever, desc, timeout)
         if isinstance(selector, Selector):
             func = self.get_is_not_on_page_callable(selector, desc=desc)
         else:
@@ -312,160 +882,212 @@ class Browser(object):
             func = [partial(EC_condition(i.element, *args, **kwargs), self.driver) for i in pe]
         self.wait_until_not(func, forever=forever, desc=desc, timeout=timeout)
 
+    def wait_until_clickable(self, selector: Union[Selector, PageElement], element_text: str = None,
+                             element_index: int = None, desc: str = None, timeout: int = None) -> PageElement:
+        # the element is looked up once (or taken from the handle cache), then only its state is polled
+        found = []
+
+        def clickable():
+            try:
+                found[:] = [self.get_page_element(selector, element_text=element_text, element_index=element_index)]
+                return found[0].is_displayed() and found[0].is_enabled()
+            except (NoSuchElementException, IndexError):
+                return False
+            except StaleElementReferenceException:
+                self._forget_handle(selector, element_text, element_index)
+                return False
+
+        if isinstance(selector, PageElement):
+            return selector
+        self.wait_until(clickable, desc=desc, timeout=timeout)
+        return found[0]
+
+    @instrument.waits
     def wait_until(self, func: Union[Callable, List[Callable]], forever: bool = False, desc: str = None,
                    timeout: int = None):
-        log(f'[wait_until]: {desc}' if desc else None, end=' ... ')
+        logf('[wait_until]: %s' if desc else None, desc, end=' ... ')
         if timeout is not None:
             self.driver_wait._timeout = timeout
+        self.driver_wait.policy = self.settings.poll_policy
 
         if type(func) is list:
             until = lambda driver: all([i() for i in func])
         else:
             until = lambda driver: func()
 
-        while 1:
-            try:
-                self.driver_wait.until(until)
-                break
-            except TimeoutException as e:
-                log(f'[wait_until]: {desc} caught TimeoutException', 1)
-                if not forever:
-                    raise e
-
-        self.driver_wait._timeout = self.settings.timeout_wait
-        log(f'done' if desc else None)
-
+        try:
+            while 1:
+                try:
+                    self.driver_wait.until(until)
+                    break
+                except TimeoutException as e:
+                    logf('[wait_until]: %s caught TimeoutException', desc, min_verbose=1)
+                    if not forever:
+                        raise e
+        finally:
+            # a timeout given for one call must not stick to the next waits
+            self.driver_wait._timeout = self.settings.timeout_wait
+        logf('done' if desc else None)
+
+    @instrument.waits
     def wait_until_not(self, func: Union[Callable, List[Callable]], forever: bool = False, desc: str = None,
                        timeout: int = None):
-        log(f'[wait_until_not]: {desc}' if desc else None, end=' ... ')
+        logf('[wait_until_not]: %s' if desc else None, desc, end=' ... ')
         if timeout is not None:
             self.driver_wait._timeout = timeout
+        self.driver_wait.policy = self.settings.poll_policy
 
         if type(func) is list:
             until = lambda driver: all([not i() for i in func])
         else:
             until = lambda driver: not func()
 
-        while 1:
-            try:
-                self.driver_wait.until(until)
-                break
-            except TimeoutException as e:
-                log(f'[wait_until]: {desc} caught TimeoutException', 1)
-                if not forever:
-                    raise e
-
-        self.driver_wait._timeout = self.settings.timeout_wait
-        log(f'done' if desc else None)
-
-    def _get_callable_until(self, until: Union[Selector, List[Selector],
-                                               Callable, List[Callable]]) -> Union[Callable, List[Callable]]:
-        if until is None:
-            pass
-        elif isinstance(until, Selector):
-            until = self.get_is_on_page_callable(until)
-        elif callable(until):
-            pass
-        elif isinstance(until[0], Selector):
-            until = [self.get_is_on_page_callable(i) for i in until]
-        elif callable(until[0]):
-            pass
-        else:
-            raise StopIteration
-        return until
-
-    def _get_callable_until_lost(self, until_lost: Union[Selector, List[Selector]]) -> Union[Callable, List[Callable]]:
-        if until_lost is None:
-            pass
-        elif isinstance(until_lost, Selector):
-            until_lost = self.get_is_not_on_page_callable(until_lost)
-        elif isinstance(until_lost, list):
-            until_lost = [self.get_is_not_on_page_callable(i) for i in until_lost]
-        else:
-            raise StopIteration
-        return until_lost
+        try:
+            while 1:
+                try:
+                    self.driver_wait.until(until)
+                    break
+                except TimeoutException as e:
+                    logf('[wait_until]: %s caught TimeoutException', desc, min_verbose=1)
+                    if not forever:
+                        raise e
+        finally:
+            self.driver_wait._timeout = self.settings.timeout_wait
+        logf('done' if desc else None)
+
+    def check_conditions(self, until: Any = None, until_lost: Any = None, empty: Any = None, reload: Any = None,
+                         desc: str = None) -> Matched:
+        # Selectors and TextConditions are checked together by one script
+        matched = Conditions(until, until_lost, empty, reload).check(self.driver)
+        logf('[check_conditions]: %s: %s' if desc else None, desc, matched)
+        return matched
 
     def condition_text_is_in(self, selector: Selector, text: str, desc: str = None) -> bool:
         if self.is_on_page(selector):
             found = self.find_element(selector).text
             if text in found:
-                log(f'[condition_text_is_in:True]: {desc}: "{text}" in {found}' if desc else None)
+                logf('[condition_text_is_in:True]: %s: "%s" in %s' if desc else None, desc, text, found)
                 return True
             else:
-                log(f'[condition_text_is_in:False]: {desc}: "{text}" not in {found}' if desc else None)
+                logf('[condition_text_is_in:False]: %s: "%s" not in %s' if desc else None, desc, text, found)
                 return False
-        log(f'[condition_text_is_in:False]: {desc}: "{text}" not in {selector}' if desc else None)
+        logf('[condition_text_is_in:False]: %s: "%s" not in %s' if desc else None, desc, text, selector)
         return False
 
     def condition_text_not_in(self, selector: Selector, text: str, desc: str = None) -> bool:
         if self.is_on_page(selector):
             found = self.find_element(selector).text
             if text not in found:
-                log(f'[condition_text_not_in:True]: {desc}: "{text}" not in {found}' if desc else None)
+                logf('[condition_text_not_in:True]: %s: "%s" not in %s' if desc else None, desc, text, found)
                 return True
             else:
-                log(f'[condition_text_not_in:False]: {desc}: "{text}" in {found}' if desc else None)
+                logf('[condition_text_not_in:False]: %s: "%s" in %s' if desc else None, desc, text, found)
                 return False
-        log(f'[condition_text_not_in:False]: {desc}: "{text}" in {selector}' if desc else None)
+        logf('[condition_text_not_in:False]: %s: "%s" in %s' if desc else None, desc, text, selector)
         return False
 
     def condition_text_equal(self, selector: Selector, text: str, desc: str = None) -> bool:
         if self.is_on_page(selector):
             found = self.find_element(selector).text
             if text == found:
-                log(f'[condition_text_equal:True]: {desc}: "{text}" == {found}' if desc else None)
+                logf('[condition_text_equal:True]: %s: "%s" == %s' if desc else None, desc, text, found)
                 return True
             else:
-                log(f'[condition_text_equal:False]: {desc}: "{text}" != {found}' if desc else None)
+                logf('[condition_text_equal:False]: %s: "%s" != %s' if desc else None, desc, text, found)
                 return False
-        log(f'[condition_text_equal:False]: {desc}: "{text}" != {selector}' if desc else None)
+        logf('[condition_text_equal:False]: %s: "%s" != %s' if desc else None, desc, text, selector)
         return False
 
     def condition_text_not_equal(self, selector: Selector, text: str, desc: str = None) -> bool:
         if self.is_on_page(selector):
             found = self.find_element(selector).text
             if text != found:
-                log(f'[condition_text_not_equal:True]: {desc}: "{text}" != {found}' if desc else None)
+                logf('[condition_text_not_equal:True]: %s: "%s" != %s' if desc else None, desc, text, found)
                 return True
             else:
-                log(f'[condition_text_not_equal:False]: {desc}: "{text}" == {found}' if desc else None)
+                logf('[condition_text_not_equal:False]: %s: "%s" == %s' if desc else None, desc, text, found)
                 return False
-        log(f'[condition_text_not_equal:False]: {desc}: "{text}" == {selector}' if desc else None)
+        logf('[condition_text_not_equal:False]: %s: "%s" == %s' if desc else None, desc, text, selector)
         return False
 
+    @instrument.waits
     def is_reached_page(self, until: Union[Selector, List[Selector], Callable, List[Callable]],
                         until_lost: Union[Selector, List[Selector]], empty: Callable, reload: Callable,
                         desc: str = None, timeout: int = None) -> bool:
-        until = self._get_callable_until(until)
-        until_lost = self._get_callable_until_lost(until_lost)
+        observed = self._get_observed_selectors(until, until_lost) if self.settings.observe_dom else None
+        # observed selectors are waited for by wait_for_dom, only empty and reload are checked here
+        if observed is None:
+            conditions = Conditions(until, until_lost, empty, reload)
+        else:
+            conditions = Conditions(empty=empty, reload=reload)
         tt = time.time()
         timeout = self.settings.timeout_wait if timeout is None else timeout
+        delays = self.settings.poll_policy.intervals()
         while 1:
-            log(f'[is_reached_page]: {desc}' if desc else None)
-            if CC.is_empty(empty):
+            logf('[is_reached_page]: %s' if desc else None, desc)
+            matched = conditions.check(self.driver)
+            if matched.empty:
                 return True
-            if CC.is_reload(reload):
+            if matched.reload:
                 if not self.wait_page_loading:
                     self.stop_page_loading()
-                self.driver.refresh()
+                self._reload()
                 continue
-            if CC.is_reached(until) and CC.is_reached(until_lost):
+            if observed is None and matched.reached:
                 return True
+            if observed is not None:
+                left = max(timeout - (time.time() - tt), 0)
+                if empty is not None or reload is not None:
+                    # empty and reload are python callables, so they still have to be polled
+                    left = min(left, next(delays))
+                if self.wait_for_dom(*observed, timeout=left):
+                    return True
             if time.time() - tt >= timeout:
                 return False
-            time.sleep(0.5)
-        log(f'[is_reached_page]: done' if desc else None)
+            if observed is None:
+                instrument.sleep(next(delays))
+        logf('[is_reached_page]: done' if desc else None)
+
+    def _reload(self):
+        # a refresh loads the page again: its requests start over and it counts as a visited page
+        if self.network is not None:
+            self.network.reset()
+        self.driver.refresh()
+        if self.lifecycle is not None:
+            self.lifecycle.visited()
+        self._invalidate_page_cache()
 
     def go(self, url: str,
            until: Union[Selector, List[Selector], Callable, List[Callable]] = None,
            until_lost: Union[Selector, List[Selector]] = None,
            empty: Callable = None, reload: Callable = None, is_reached_url: Callable = None, sleep: float = 1.0,
-           desc: str = None, timeout: int = None):
+           desc: str = None, timeout: int = None, load_profile: LoadProfile = None, until_network_idle: int = None):
+        # until_network_idle (ms, needs Settings.track_network) replaces the sleep: with wait_page_loading=False
+        # loading is stopped as soon as the document and its XHR/fetch requests are done
         self.settings.url = url
+        if self.lifecycle is not None and self.lifecycle.should_recycle():
+            if len(self.driver.window_handles) > 1:
+                # a new session would drop the other tabs, so recycling waits until they are closed
+                logf('[go]: recycling postponed while tabs are open', min_verbose=1)
+            else:
+                self.recycle(desc=desc)
+        profile = load_profile or self.settings.load_profile
+        if profile is not None or self._load_profile is not None:
+            self.use_load_profile(profile)
         while 1:
-            log(f'[go:"{url}"]: {desc}' if desc else None)
+            logf('[go:"%s"]: %s' if desc else None, url, desc)
+            if self.network is not None:
+                self.network.reset()
+            if self.settings.settle:
+                self._track_requests()
             self.driver.get(url)
-            time.sleep(sleep)
+            if self.lifecycle is not None:
+                self.lifecycle.visited()
+            self._invalidate_page_cache()
+            if until_network_idle is None:
+                self._settle(sleep)
+            else:
+                self.wait_network_idle(until_network_idle, timeout=timeout)
 
             if callable(is_reached_url):
                 self.wait_until(partial(is_reached_url(url), self.driver), timeout=timeout)
@@ -477,27 +1099,28 @@ class Browser(object):
             else:
                 if not self.wait_page_loading:
                     self.stop_page_loading()
-                log(f'[go:refresh:"{url}"]: {desc}' if desc else None)
-                self.driver.refresh()
-                time.sleep(sleep)
+                logf('[go:refresh:"%s"]: %s' if desc else None, url, desc)
+                self._reload()
+                self._settle(sleep)
                 if not self.wait_page_loading:
                     self.stop_page_loading()
 
         if not self.wait_page_loading:
             self.stop_page_loading()
-        log(f'[go]: done' if desc else None)
+        logf('[go]: done' if desc else None)
 
     def click(self, selector: Union[Selector, PageElement], element_text: str = None, element_index: int = None,
               until: Union[Selector, List[Selector], Callable, List[Callable]] = None,
               until_lost: Union[Selector, List[Selector]] = None,
               empty: Callable = None, reload: Callable = None,
               sleep: float = 0.5, desc: str = None, timeout: int = None):
-        log(f'[click:{selector}[{element_text}, {element_index}]]: {desc}' if desc else None)
-        if isinstance(selector, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, selector, timeout=timeout)
-        pe = self.get_page_element(selector, element_text=element_text, element_index=element_index)
-        pe.element.click()
-        time.sleep(sleep)
+        logf('[click:%s[%s, %s]]: %s' if desc else None, selector, element_text, element_index, desc)
+        pe = self.wait_until_clickable(selector, element_text=element_text, element_index=element_index,
+                                       timeout=timeout)
+        pe.click()
+        # a click may navigate without anything reading current_url
+        self._invalidate_page_cache()
+        self._settle(sleep)
 
         self.wait_until(lambda: self.is_reached_page(until, until_lost, empty, reload),
                         desc=f'[click:waiting]', timeout=timeout)
@@ -506,147 +1129,191 @@ class Browser(object):
 
     def refresh(self, until: Union[Selector, List[Selector], Callable, List[Callable]] = None, sleep: float = 5.0,
                 desc: str = None):
-        log(f'[refresh]: {desc}' if desc else None, end=' ... ')
-        until = self._get_callable_until(until)
+        logf('[refresh]: %s' if desc else None, desc, end=' ... ')
+        conditions = Conditions(until)
         while 1:
-            self.driver.refresh()
-            time.sleep(sleep)
-            if CC.is_reached(until):
+            self._reload()
+            self._settle(sleep)
+            if conditions.check(self.driver).reached:
                 break
             if not self.wait_page_loading:
                 self.stop_page_loading()
 
         if not self.wait_page_loading:
             self.stop_page_loading()
-        log(f'done' if desc else None)
+        logf('done' if desc else None)
 
     @property
     def current_url(self) -> str:
-        return self.driver.current_url
+        url = self.driver.current_url
+        # a changed url means a new document, whatever navigated
+        if self._handles_url is not None and url != self._handles_url:
+            self._invalidate_page_cache()
+        self._handles_url = url
+        return url
 
     def get_cookies(self, desc: str = None) -> dict:
-        log(f'[get_cookies]: {desc}' if desc else None)
+        logf('[get_cookies]: %s' if desc else None, desc)
         return self.driver.get_cookies()
 
     def set_cookies(self, cookies, desc: str = None):
-        log(f'[set_cookies]: {desc}' if desc else None)
+        logf('[set_cookies]: %s' if desc else None, desc)
         for cookie in cookies:
             if 'expiry' in cookie:
                 del cookie['expiry']
             self.driver.add_cookie(cookie)
 
-    @catch.staleElementReferenceException()
+    @property
+    def supports_cdp(self) -> bool:
+        return self.settings.driver_name == Names.chrome.value
+
+    def save_session(self, path: str, desc: str = None):
+        # cookies, localStorage, sessionStorage and url into one gzipped json file
+        logf('[save_session]: %s: %s' if desc else None, desc, path)
+        state = self.driver.execute_script(scripts.GET_STORAGE)
+        if self.supports_cdp:
+            # cookies of all domains, not only of the current page
+            state['cookies'] = session.from_cdp_cookies(self.execute_cdp('Network.getAllCookies')['cookies'])
+        else:
+            state['cookies'] = self.driver.get_cookies()
+        session.save_state(path, state)
+
+    def restore_session(self, path: str, desc: str = None, **kwargs) -> dict:
+        # kwargs are passed to go(), which finally opens the saved url
+        logf('[restore_session]: %s: %s' if desc else None, desc, path)
+        state = session.load_state(path)
+        if self.supports_cdp:
+            self.execute_cdp('Network.setCookies', {'cookies': session.to_cdp_cookies(state['cookies'])})
+            source = session.storage_script(state['origin'], state['local'], state['session'])
+            identifier = self.execute_cdp('Page.addScriptToEvaluateOnNewDocument', {'source': source})['identifier']
+            try:
+                self.go(state['url'], **kwargs)
+            finally:
+                self.execute_cdp('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+        else:
+            # without cdp, cookies and storage can only be set on a page of their origin
+            self.driver.get(state['url'])
+            for cookie in state['cookies']:
+                cookie.pop('expiry', None)
+                try:
+                    self.driver.add_cookie(cookie)
+                except InvalidCookieDomainException:
+                    logf('[restore_session]: skipped cookie of %s' if desc else None, cookie.get('domain'))
+            self.driver.execute_script(scripts.SET_STORAGE, state['local'], state['session'])
+            self.go(state['url'], **kwargs)
+        return state
+
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def select(self, selector: Union[Selector, PageElement], element_text: str = None, element_index: int = None,
                sleep: float = 0.5, desc: str = None):
-        log(f'[select:{selector}[{element_text}, {element_index}]]: {desc}' if desc else None, end=' ... ')
-        if isinstance(selector, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, selector)
-        pe = self.get_page_element(selector, element_text=element_text, element_index=element_index)
-        assert not pe.element.is_selected()
-        pe.element.click()
+        logf('[select:%s[%s, %s]]: %s' if desc else None, selector, element_text, element_index, desc, end=' ... ')
+        pe = self.wait_until_clickable(selector, element_text=element_text, element_index=element_index)
+        assert not pe.is_selected()
+        pe.click()
         self.wait_until_page_element(EC.is_selected, pe)
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+        self._settle(sleep)
+        logf('done' if desc else None)
 
-    @catch.staleElementReferenceException()
+    @catch.staleElementReferenceException(sleep=None, retries=3)
     def deselect(self, selector: Union[Selector, PageElement], element_text: str = None, element_index: int = None,
                  sleep: float = 0.5, desc: str = None):
-        log(f'[deselect:{selector}[{element_text}, {element_index}]]: {desc}' if desc else None, end=' ... ')
-        if isinstance(selector, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, selector)
-        pe = self.get_page_element(selector, element_text=element_text, element_index=element_index)
-        assert pe.element.is_selected()
-        pe.element.click()
+        logf('[deselect:%s[%s, %s]]: %s' if desc else None, selector, element_text, element_index, desc, end=' ... ')
+        pe = self.wait_until_clickable(selector, element_text=element_text, element_index=element_index)
+        assert pe.is_selected()
+        pe.click()
         self.wait_until_not_page_element(EC.is_selected, pe)
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+        self._settle(sleep)
+        logf('done' if desc else None)
 
     def fill_text(self, selector: Union[Selector, PageElement], text: str, element_index: int = None,
                   clear: bool = True, quick: bool = False, sleep: float = 0.5, desc: str = None):
-        log(f'[fill_text:{selector}={text}]: {desc}' if desc else None, end=' ... ')
-        if isinstance(selector, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, selector)
-        pe = self.get_page_element(selector, element_index=element_index)
+        logf('[fill_text:%s=%s]: %s' if desc else None, selector, text, desc, end=' ... ')
+        pe = self.wait_until_clickable(selector, element_index=element_index)
         if clear:
-            pe.element.clear()
+            pe.clear()
 
         if quick:
-            pe.element.send_keys(text)
+            pe.send_keys(text)
         else:
             for s in text:
-                pe.element.send_keys(s)
-                time.sleep(random.random() / 10)
+                pe.send_keys(s)
+                instrument.sleep(random.random() / 10)
 
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+        self._settle(sleep)
+        logf('done' if desc else None)
 
     def fill_text_one_by_one(self, selector: Selector, texts: List[str], check_length: bool = True,
                              quick: bool = False, sleep: float = 0.5, desc: str = None):
-        log(f'[fill_text_one_by_one:{selector}={texts}]: {desc}' if desc else None, end=' ... ')
+        logf('[fill_text_one_by_one:%s=%s]: %s' if desc else None, selector, texts, desc, end=' ... ')
         self.wait_until_selector(EC.element_to_be_clickable, selector)
         pes = self.find_elements(selector)
         if check_length:
             assert len(pes) == len(texts)
 
         for pe, text in zip(pes, texts):
-            pe.element.clear()
-            pe.element.send_keys(text)
+            pe.clear()
+            pe.send_keys(text)
             if not quick:
-                time.sleep(random.random() / 5)
-
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+                instrument.sleep(random.random() / 5)
+
+        self._settle(sleep)
+        logf('done' if desc else None)
+
+    def fill_form(self, fields: Dict[Union[Selector, PageElement], Any], verify: bool = False,
+                  sleep: float = 0.5, desc: str = None):
+        # sets every value and fires input and change events in one script, nothing is typed;
+        # bools check checkboxes and radios, a list selects the options of a multiple select
+        logf('[fill_form:%s fields]: %s' if desc else None, len(fields), desc, end=' ... ')
+        keys = list(fields)
+        values = ['' if fields[key] is None else fields[key] for key in keys]
+        args = [[key.element, None, None, value] if isinstance(key, PageElement) else [None, key.by, key.value, value]
+                for key, value in zip(keys, values)]
+        result = self.driver.execute_script(scripts.FILL_FORM, args, verify)
+        # change handlers may replace the form or submit it
+        self._invalidate_page_cache()
+        if result['missing']:
+            raise NoSuchElementException(f'fill_form: not found {[keys[i] for i in result["missing"]]}')
+        if result['mismatched']:
+            mismatched = ', '.join(f'{keys[i]}={found!r}' for i, found in result['mismatched'])
+            raise InvalidElementStateException(f'fill_form: values not kept {mismatched}')
+        self._settle(sleep)
+        logf('done' if desc else None)
+
+    def actions(self, sleep: float = 0.5, desc: str = None) -> Actions:
+        # with browser.actions() as a: a.move_to(...).click().press(Keys.ENTER)
+        # everything queued is sent with one perform() and settled once when the block ends
+        return Actions(self, sleep=sleep, desc=desc)
 
     def move_cursor(self, selector: Union[Selector, PageElement], element_text: str = None, element_index: int = None,
                     sleep: float = 0.5, desc: str = None):
-        log(f'[move_cursor:{selector}]: {desc}' if desc else None, end=' ... ')
-        if isinstance(selector, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, selector)
-        pe = self.get_page_element(selector, element_text=element_text, element_index=element_index)
-        self.driver_actions.reset_actions()
-        self.driver_actions.move_to_element(pe.element)
-        self.driver_actions.perform()
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+        logf('[move_cursor:%s]: %s' if desc else None, selector, desc, end=' ... ')
+        pe = self.wait_until_clickable(selector, element_text=element_text, element_index=element_index)
+        self.actions(sleep=sleep).move_to(pe).perform()
+        logf('done' if desc else None)
 
     def drug_and_drop(self, source: Union[Selector, PageElement], target: Union[Selector, PageElement],
                       source_text: str = None, target_text: str = None,
                       source_index: int = None, target_index: int = None,
                       sleep: float = 0.5, desc: str = None):
-        log(f'[drug_and_drop:{source}->{target}]: {desc}' if desc else None, end=' ... ')
-        if isinstance(source, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, source)
-        if isinstance(target, Selector):
-            self.wait_until_selector(EC.element_to_be_clickable, target)
-        source = self.get_page_element(source, element_text=source_text, element_index=source_index)
-        target = self.get_page_element(target, element_text=target_text, element_index=target_index)
-        self.driver_actions.reset_actions()
-        self.driver_actions.drag_and_drop(source, target).perform()
-        time.sleep(sleep)
-        log(f'done' if desc else None)
+        logf('[drug_and_drop:%s->%s]: %s' if desc else None, source, target, desc, end=' ... ')
+        source = self.wait_until_clickable(source, element_text=source_text, element_index=source_index)
+        target = self.wait_until_clickable(target, element_text=target_text, element_index=target_index)
+        self.actions(sleep=sleep).drag_and_drop(source, target).perform()
+        logf('done' if desc else None)
 
     def press_key(self, key, desc: str = None):
-        log(f'[press_key:{key}]: {desc}' if desc else None, end=' ... ')
-        self.driver_actions.reset_actions()
-        self.driver_actions.key_down(key).key_up(key).perform()
-        log(f'done' if desc else None)
+        logf('[press_key:%s]: %s' if desc else None, repr(key), desc, end=' ... ')
+        self.actions(sleep=0).press(key).perform()
+        logf('done' if desc else None)
 
     def press_Enter(self, desc: str = None):
-        log(f'[press_Enter]: {desc}' if desc else None, end=' ... ')
-        self.press_key(Keys.ENTER)
-        log(f'done' if desc else None)
+        self.press_key(Keys.ENTER, desc=desc)
 
     def press_Backspace(self, desc: str = None):
-        log(f'[press_Backspace]: {desc}' if desc else None, end=' ... ')
-        self.press_key(Keys.BACKSPACE)
-        log(f'done' if desc else None)
+        self.press_key(Keys.BACKSPACE, desc=desc)
 
     def press_Tab(self, desc: str = None):
-        log(f'[press_Tab]: {desc}' if desc else None, end=' ... ')
-        self.press_key(Keys.TAB)
-        log(f'done' if desc else None)
+        self.press_key(Keys.TAB, desc=desc)
 
     def press_Esc(self, desc: str = None):
-        log(f'[press_Esc]: {desc}' if desc else None, end=' ... ')
-        self.press_key(Keys.ESCAPE)
-        log(f'done' if desc else None)
+        self.press_key(Keys.ESCAPE, desc=desc)
@@ -0,0 +1,147 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from multiprocessing import util
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from pakselenium.browser import Browser, Settings
+from pakselenium.utils.logs import logf
+
+
+@dataclass
+class CrawlResult(object):
+    url: str
+    value: Any = None
+    # repr of the last exception, exceptions do not always survive pickling
+    error: Optional[str] = None
+    attempts: int = 0
+    worker: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class WorkerStats(object):
+    worker: int
+    pages: int = 0
+    failures: int = 0
+    retries: int = 0
+    busy: float = 0.0
+    started: float = field(default_factory=time.time)
+
+    @property
+    def pages_per_minute(self) -> float:
+        elapsed = time.time() - self.started
+        return self.pages * 60 / elapsed if elapsed > 0 else 0.0
+
+
+def new_browser(settings: Settings) -> Browser:
+    browser = Browser(settings)
+    browser.new_session()
+    return browser
+
+
+class _Worker(object):
+    # lives in a pool process and owns its browser until the process exits
+
+    def __init__(self, settings: Settings, extract: Callable[[Browser, str], Any],
+                 factory: Callable[[Settings], Browser], retries: int, go_kwargs: dict):
+        self.extract = extract
+        self.retries = retries
+        self.go_kwargs = go_kwargs
+        self.stats = WorkerStats(os.getpid())
+        self.browser = factory(settings)
+        util.Finalize(self, self.close, exitpriority=10)
+
+    def crawl(self, url: str) -> CrawlResult:
+        result = CrawlResult(url, worker=self.stats.worker)
+        tt = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                if attempt:
+                    self.stats.retries += 1
+                    self.browser.new_session()
+                self.browser.go(url, **self.go_kwargs)
+                result.value = self.extract(self.browser, url)
+                result.error = None
+                break
+            except Exception as e:
+                logf('[crawl]: %s failed on attempt %s: %r', url, attempt + 1, e, min_verbose=1)
+                result.error = repr(e)
+        self.stats.busy += time.perf_counter() - tt
+        if result.ok:
+            self.stats.pages += 1
+        else:
+            self.stats.failures += 1
+        return result
+
+    def close(self):
+        self.browser.quit()
+
+
+_worker: Optional[_Worker] = None
+
+
+def _init_worker(*args):
+    global _worker
+    _worker = _Worker(*args)
+
+
+def _crawl(url: str) -> Tuple[CrawlResult, WorkerStats]:
+    return _worker.crawl(url), _worker.stats
+
+
+class Crawler(object):
+    # extract(browser, url) and factory(settings) run in the workers, so they have to be picklable:
+    # module-level functions, not lambdas or closures
+    stats: Dict[int, WorkerStats]
+
+    def __init__(self, settings: Settings, extract: Callable[[Browser, str], Any],
+                 processes: int = None, in_flight: int = None, retries: int = 1,
+                 factory: Callable[[Settings], Browser] = new_browser, **go_kwargs):
+        assert retries >= 0
+        self.settings = settings
+        self.extract = extract
+        self.processes = processes or os.cpu_count() or 1
+        self.in_flight = in_flight or 2 * self.processes
+        assert self.in_flight > 0
+        self.retries = retries
+        self.factory = factory
+        self.go_kwargs = go_kwargs
+        self.stats = {}
+
+    def run(self, urls: Iterable[str]) -> Iterator[CrawlResult]:
+        # results come in the order pages finish; at most in_flight urls are taken from urls ahead of them
+        urls = iter(urls)
+        executor = ProcessPoolExecutor(self.processes, initializer=_init_worker,
+                                       initargs=(self.settings, self.extract, self.factory, self.retries,
+                                                 self.go_kwargs))
+        pending = set()
+        try:
+            pending = {executor.submit(_crawl, url) for url in itertools.islice(urls, self.in_flight)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result, stats = future.result()
+                    self.stats[stats.worker] = stats
+                    pending.update(executor.submit(_crawl, url) for url in itertools.islice(urls, 1))
+                    logf('[crawl]: %s [%s]', result.url, 'ok' if result.ok else result.error, min_verbose=1)
+                    yield result
+        finally:
+            # urls not started yet are dropped when the caller stops early; shutdown(cancel_futures=True) is 3.9+
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+        logf('[crawl]: done, %s', self.report(), min_verbose=1)
+
+    def report(self) -> str:
+        lines = []
+        for stats in sorted(self.stats.values(), key=lambda i: i.worker):
+            lines.append(f'worker {stats.worker}: {stats.pages} pages, {stats.failures} failed, '
+                         f'{stats.retries} retries, {stats.pages_per_minute:.1f} pages/min')
+        return '\n'.join(lines)
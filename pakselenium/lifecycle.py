@@ -0,0 +1,130 @@
+import atexit
+import weakref
+from typing import List, Optional, TYPE_CHECKING
+
+from pakselenium.utils.logs import logf
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+if TYPE_CHECKING:
+    from pakselenium.browser import Browser
+
+MB = 1024 * 1024
+
+# sessions not quit yet, quit at interpreter exit at the latest
+_live = weakref.WeakSet()
+_registered = False
+
+
+class Lifecycle(object):
+    # one driver session of a Browser: pages visited, its process tree and memory, and a quit that
+    # leaves no browser processes behind. Process tracking and RSS need psutil.
+
+    def __init__(self, browser: 'Browser', max_pages: int = None, max_rss: int = None, check_every: int = 10):
+        # max_rss in MB of the whole process tree, checked every check_every pages
+        check_requirements(max_rss)
+        self.browser = browser
+        self.driver = browser.driver
+        self.max_pages = max_pages
+        self.max_rss = max_rss
+        self.check_every = max(check_every, 1)
+        self.pages = 0
+        self._roots: Optional[List[int]] = None
+        _track(self)
+
+    def __repr__(self):
+        return f'Lifecycle(pages={self.pages})'
+
+    def _get_roots(self) -> List[int]:
+        # an own chromedriver is the root of everything; a shared one serves other sessions as well,
+        # so its browsers are left to the service
+        if self._roots is None:
+            self._roots = []
+            service = getattr(self.driver, 'service', None)
+            if getattr(service, 'process', None) is not None:
+                self._roots.append(service.process.pid)
+        return self._roots
+
+    def processes(self) -> list:
+        if psutil is None:
+            return []
+        found = []
+        for pid in self._get_roots():
+            try:
+                root = psutil.Process(pid)
+                found.append(root)
+                found.extend(root.children(recursive=True))
+            except psutil.NoSuchProcess:
+                pass
+        return found
+
+    def rss(self) -> int:
+        total = 0
+        for process in self.processes():
+            try:
+                total += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    def visited(self):
+        self.pages += 1
+
+    def should_recycle(self) -> bool:
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            logf('[lifecycle]: %s pages visited, recycle due', self.pages, min_verbose=1)
+            return True
+        if self.max_rss is not None and self.pages and self.pages % self.check_every == 0:
+            rss = self.rss()
+            if rss >= self.max_rss * MB:
+                logf('[lifecycle]: rss %.0f MB after %s pages, recycle due', rss / MB, self.pages, min_verbose=1)
+                return True
+        return False
+
+    def quit(self, timeout: float = 3.0):
+        # processes are collected before the session ends, survivors are killed after timeout
+        _live.discard(self)
+        processes = self.processes()
+        try:
+            self.driver.quit()
+        except Exception:
+            # dead session or the driver process is gone, its children may still be running
+            pass
+        if not processes:
+            return
+        gone, alive = psutil.wait_procs(processes, timeout=timeout)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
+        if alive:
+            logf('[lifecycle]: killed %s leftover processes', len(alive), min_verbose=1)
+
+
+def check_requirements(max_rss: Optional[int], shared_service: bool = False):
+    # called before a driver starts as well, so a missing psutil does not leave a browser running
+    if max_rss is None:
+        return
+    if psutil is None:
+        raise ImportError('recycling by memory requires psutil: pip install psutil')
+    if shared_service:
+        # chromedriver does not tell which of its browsers belongs to a session, so there is nothing to measure
+        raise ValueError('recycling by memory needs an own chromedriver, not shared_service')
+
+
+def _track(lifecycle: Lifecycle):
+    # registered on first use, so it runs before the atexit stop of a shared chromedriver started earlier
+    global _registered
+    if not _registered:
+        atexit.register(_quit_all)
+        _registered = True
+    _live.add(lifecycle)
+
+
+def _quit_all():
+    for lifecycle in list(_live):
+        lifecycle.quit()
@@ -0,0 +1,105 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import List, Callable
+
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+from pakselenium.browser import Browser, Settings
+from pakselenium.utils.logs import logf
+
+
+class BrowserPool(object):
+    browsers: List[Browser]
+
+    def __init__(self, settings: Settings, size: int,
+                 health_check: Callable[[Browser], bool] = None,
+                 timeout: float = None):
+        assert settings.driver_name
+        assert size > 0
+        self.settings = settings
+        self.size = size
+        self.health_check = Browser.is_alive if health_check is None else health_check
+        self.timeout = timeout
+        self.browsers = []
+        self._idle = queue.Queue()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _new_browser(self) -> Browser:
+        settings = replace(self.settings, driver_kwargs=dict(self.settings.driver_kwargs or {}))
+        browser = Browser(settings)
+        browser.new_session()
+        return browser
+
+    def start(self) -> 'BrowserPool':
+        # drivers start in parallel, so warming up N browsers costs about one startup
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._new_browser) for _ in range(self.size)]
+        failed = [i.exception() for i in futures if i.exception() is not None]
+        if failed:
+            # the browsers that did start are not handed out, so they are closed here
+            for future in futures:
+                if future.exception() is None:
+                    future.result().close()
+            raise failed[0]
+        for browser in (i.result() for i in futures):
+            self.browsers.append(browser)
+            self._idle.put(browser)
+        logf('[pool]: started %s browsers', self.size, min_verbose=1)
+        return self
+
+    def checkout(self, timeout: float = None) -> Browser:
+        timeout = self.timeout if timeout is None else timeout
+        if not self.browsers:
+            raise WebDriverException('no browsers left in pool, all of them failed to restart')
+        try:
+            browser = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutException(f'no idle browser in pool after {timeout}s')
+        if browser is None:
+            # the last browser was dropped while waiting; passed on to other waiting checkouts
+            self._idle.put(None)
+            raise WebDriverException('no browsers left in pool, all of them failed to restart')
+        return browser
+
+    def checkin(self, browser: Browser):
+        assert browser in self.browsers
+        if not self.health_check(browser):
+            logf('[pool]: recycling unhealthy browser', min_verbose=1)
+            try:
+                browser.new_session()
+            except Exception as e:
+                # a browser without a session is not handed out again, the pool gets smaller;
+                # checkin runs in a finally, so the error is logged instead of hiding the caller's one
+                logf('[pool]: recycling failed, dropping browser: %r', e, min_verbose=1)
+                self.browsers.remove(browser)
+                browser.close()
+                if not self.browsers:
+                    self._idle.put(None)
+                return
+        self._idle.put(browser)
+
+    @contextmanager
+    def browser(self, timeout: float = None):
+        browser = self.checkout(timeout=timeout)
+        try:
+            yield browser
+        finally:
+            self.checkin(browser)
+
+    @property
+    def idle(self) -> int:
+        return len([i for i in self._idle.queue if i is not None])
+
+    def close(self):
+        for browser in self.browsers:
+            browser.close()
+        self.browsers = []
+        self._idle = queue.Queue()
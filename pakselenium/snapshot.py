@@ -0,0 +1,194 @@
+from functools import lru_cache
+from typing import List, Callable, Optional, TYPE_CHECKING
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from pakselenium.utils.logs import logf
+
+try:
+    import lxml.html
+    from cssselect import HTMLTranslator
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+if TYPE_CHECKING:
+    from pakselenium.browser import PageElement, Selector
+
+
+@lru_cache(maxsize=256)
+def _compile(by: str, value: str, scoped: bool):
+    # scoped queries (from an element) only match descendants, like selenium's find_elements_from
+    prefix = 'descendant::' if scoped else 'descendant-or-self::'
+    if by == By.XPATH:
+        return etree.XPath(value)
+    elif by == By.CSS_SELECTOR:
+        css = value
+    elif by == By.ID:
+        css = '[id="%s"]' % value
+    elif by == By.CLASS_NAME:
+        css = '.%s' % value
+    elif by == By.NAME:
+        css = '[name="%s"]' % value
+    elif by in (By.TAG_NAME, By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        css = value if by == By.TAG_NAME else 'a'
+    else:
+        raise StopIteration(by)
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix=prefix))
+
+
+_BLOCKS = {'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+           'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav',
+           'ol', 'p', 'pre', 'section', 'table', 'tbody', 'thead', 'tfoot', 'tr', 'ul', 'option'}
+_HIDDEN = {'script', 'style', 'template', 'noscript', 'head'}
+
+
+def _collect(node, parts: List[Optional[str]]):
+    # None marks a line break
+    tag = node.tag if isinstance(node.tag, str) else None
+    if tag in _HIDDEN:
+        return
+    if tag == 'br' or tag in _BLOCKS:
+        parts.append(None)
+    elif tag in ('td', 'th'):
+        parts.append(' ')
+    if tag is not None and node.text:
+        parts.append(node.text)
+    for child in node:
+        _collect(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if tag in _BLOCKS:
+        parts.append(None)
+
+
+def _text(node) -> str:
+    # close to WebElement.text: hidden content dropped, whitespace collapsed, blocks on their own lines
+    parts = []
+    _collect(node, parts)
+    text = ''.join('\n' if i is None else i.replace('\n', ' ') for i in parts)
+    lines = (' '.join(line.split()) for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class SnapshotElement(object):
+    def __init__(self, snapshot: 'Snapshot', node):
+        self.snapshot = snapshot
+        self.node = node
+        self._text = None
+
+    def __repr__(self):
+        return f"SnapshotElement('{self.text}')"
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = _text(self.node)
+        return self._text
+
+    @property
+    def tag_name(self) -> str:
+        return self.node.tag
+
+    @property
+    def xpath(self) -> str:
+        return self.snapshot.tree.getpath(self.node)
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.node.get(name)
+
+    def find_elements(self, selector: 'Selector') -> List['SnapshotElement']:
+        return self.snapshot.query(selector, self)
+
+    def to_page_element(self) -> 'PageElement':
+        # resolves the live element by its absolute xpath, valid while the page keeps its structure
+        return self.snapshot.resolve(self.xpath)
+
+
+class Snapshot(object):
+    def __init__(self, source: str, resolve: Callable[[str], 'PageElement']):
+        if lxml is None:
+            raise ImportError('Snapshot requires lxml and cssselect: pip install lxml cssselect')
+        self.root = lxml.html.fromstring(source)
+        self.tree = self.root.getroottree()
+        self.resolve = resolve
+
+    def query(self, selector: 'Selector', from_se: SnapshotElement = None) -> List[SnapshotElement]:
+        root = self.root if from_se is None else from_se.node
+        nodes = _compile(selector.by, selector.value, from_se is not None)(root)
+        ses = [SnapshotElement(self, node) for node in nodes if isinstance(node.tag, str)]
+        if selector.by == By.LINK_TEXT:
+            ses = [i for i in ses if i.text == selector.value]
+        elif selector.by == By.PARTIAL_LINK_TEXT:
+            ses = [i for i in ses if selector.value in i.text]
+        return ses
+
+    def is_on_page(self, selector: 'Selector', desc: str = None) -> bool:
+        found = bool(self.query(selector))
+        logf('[snapshot:is_on_page]: %s: %s [%s]' if desc else None, desc, selector.desc, found)
+        return found
+
+    def find_element(self, selector: 'Selector', desc: str = None) -> SnapshotElement:
+        return self.find_elements(selector, desc=desc)[0]
+
+    def find_elements(self, selector: 'Selector', desc: str = None) -> List[SnapshotElement]:
+        ses = self.query(selector)
+        if not ses:
+            raise NoSuchElementException
+        logf('[snapshot:find_elements]: %s: %s found %s' if desc else None, desc, selector.desc, ses)
+        return ses
+
+    def find_elements_with_text(self, selector: 'Selector', element_text: str,
+                                desc: str = None) -> List[SnapshotElement]:
+        ses = [i for i in self.find_elements(selector) if i.text == element_text]
+        if not ses:
+            raise NoSuchElementException
+        logf('[snapshot:find_elements_with_text]: %s: %s found %s' if desc else None, desc, selector.desc, ses)
+        return ses
+
+    def find_elements_contains(self, selector: 'Selector', element_text: str,
+                               desc: str = None) -> List[SnapshotElement]:
+        ses = [i for i in self.find_elements(selector) if element_text in i.text]
+        if not ses:
+            raise NoSuchElementException
+        logf('[snapshot:find_elements_contains]: %s: %s found %s' if desc else None, desc, selector.desc, ses)
+        return ses
+
+    def find_element_from(self, from_se: SnapshotElement, selector: 'Selector', desc: str = None) -> SnapshotElement:
+        ses = self.find_elements_from(from_se, selector, desc=desc)
+        if not ses:
+            raise NoSuchElementException
+        return ses[0]
+
+    def find_elements_from(self, from_se: SnapshotElement, selector: 'Selector',
+                           desc: str = None) -> List[SnapshotElement]:
+        ses = self.query(selector, from_se)
+        logf('[snapshot:find_elements_from]: %s: %s found %s' if desc else None, desc, selector.desc, ses)
+        return ses
+
+    def find_element_with_text_from(self, from_se: SnapshotElement, selector: 'Selector', text: str,
+                                    desc: str = None) -> SnapshotElement:
+        ses = [i for i in self.find_elements_from(from_se, selector, desc=desc) if i.text == text]
+        if not ses:
+            raise NoSuchElementException
+        return ses[0]
+
+    def _found_text(self, selector: 'Selector') -> Optional[str]:
+        ses = self.query(selector)
+        return ses[0].text if ses else None
+
+    def condition_text_is_in(self, selector: 'Selector', text: str) -> bool:
+        found = self._found_text(selector)
+        return found is not None and text in found
+
+    def condition_text_not_in(self, selector: 'Selector', text: str) -> bool:
+        found = self._found_text(selector)
+        return found is not None and text not in found
+
+    def condition_text_equal(self, selector: 'Selector', text: str) -> bool:
+        return self._found_text(selector) == text
+
+    def condition_text_not_equal(self, selector: 'Selector', text: str) -> bool:
+        found = self._found_text(selector)
+        return found is not None and text != found
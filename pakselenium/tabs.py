@@ -0,0 +1,72 @@
+from functools import wraps
+from typing import TYPE_CHECKING
+
+from selenium.common.exceptions import WebDriverException
+
+from pakselenium.utils.logs import logf
+
+if TYPE_CHECKING:
+    from pakselenium.browser import Browser
+
+
+class Tab(object):
+    # a window handle of a Browser; Browser methods called on a tab switch to its handle first,
+    # and only when another tab is current. PageElements belong to the tab they were found in.
+
+    def __init__(self, browser: 'Browser', handle: str):
+        self.browser = browser
+        self.handle = handle
+        self.url = None
+
+    def __repr__(self):
+        return f"Tab('{self.handle}', '{self.url}')"
+
+    def __getattr__(self, name: str):
+        # properties like current_url read the page, so they need the handle as well
+        if isinstance(getattr(type(self.browser), name, None), property):
+            self.activate()
+        attr = getattr(self.browser, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def call(*args, **kwargs):
+            self.activate()
+            return attr(*args, **kwargs)
+
+        return call
+
+    @property
+    def is_active(self) -> bool:
+        return self.browser._handle == self.handle
+
+    def activate(self) -> 'Tab':
+        self.browser.switch_to(self.handle)
+        return self
+
+    def open(self, url: str, desc: str = None) -> 'Tab':
+        # starts the navigation without waiting; with wait_page_loading=False (pageLoadStrategy 'none')
+        # the loads of several tabs overlap, wait for each one later with tab.wait_until_on_page(...)
+        logf('[tab:open:"%s"]: %s' if desc else None, url, desc)
+        self.activate()
+        self.browser.driver.get(url)
+        if self.browser.lifecycle is not None:
+            self.browser.lifecycle.visited()
+        self.browser._invalidate_page_cache()
+        self.url = url
+        return self
+
+    def go(self, url: str, **kwargs):
+        self.activate()
+        self.browser.go(url, **kwargs)
+        self.url = url
+
+    def close(self):
+        if self.handle not in self.browser._tabs:
+            return
+        self.activate()
+        try:
+            self.browser.driver.close()
+        except WebDriverException:
+            pass
+        self.browser._forget_tab(self.handle)
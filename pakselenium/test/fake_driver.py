@@ -0,0 +1,405 @@
+import itertools
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple, Union, Callable, Optional
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import getAttribute_js, isDisplayed_js
+
+from pakselenium.browser import Browser, Settings
+from pakselenium.utils import scripts
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+GET_ATTRIBUTE = "return (%s).apply(null, arguments);" % getAttribute_js
+IS_DISPLAYED = "return (%s).apply(null, arguments);" % isDisplayed_js
+
+_ids = itertools.count()
+
+
+def normalize(by: str, value: str) -> Tuple[str, str]:
+    # the same rewriting selenium does for w3c drivers in find_element(s)
+    if by == By.ID:
+        return By.CSS_SELECTOR, '[id="%s"]' % value
+    elif by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    elif by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, '.%s' % value
+    elif by == By.NAME:
+        return By.CSS_SELECTOR, '[name="%s"]' % value
+    return by, value
+
+
+class FakeNode(object):
+    def __init__(self, text: str = '', attributes: dict = None,
+                 children: Dict[Tuple[str, str], List['FakeNode']] = None,
+                 displayed: bool = True, enabled: bool = True, selected: bool = False,
+                 on_click: Callable[['FakeExecutor'], None] = None):
+        self.id = str(next(_ids))
+        self.text = text
+        self.attributes = {} if attributes is None else attributes
+        self.children = {normalize(*k): v for k, v in (children or {}).items()}
+        self.displayed = displayed
+        self.enabled = enabled
+        self.selected = selected
+        self.on_click = on_click
+        self.page: Optional['FakePage'] = None
+
+    def __repr__(self):
+        return f"FakeNode('{self.text}')"
+
+    @property
+    def visible_text(self) -> str:
+        # WebElement.text and the in-page text() of scripts: nothing for an element that is not rendered
+        return self.text if self.displayed else ''
+
+    def nodes(self):
+        for children in self.children.values():
+            for child in children:
+                yield child
+                yield from child.nodes()
+
+
+class FakePage(object):
+    def __init__(self, url: str, elements: Dict[Tuple[str, str], List[FakeNode]] = None, source: str = '',
+                 on_scroll: Callable[['FakeExecutor'], None] = None,
+                 network: List[List[Tuple[str, dict]]] = None):
+        # network: DevTools events of the load, one batch per read of the performance log
+        self.url = url
+        self.elements = {normalize(*k): v for k, v in (elements or {}).items()}
+        self.source = source
+        self.on_scroll = on_scroll
+        self.network = network or []
+        for node in self.nodes():
+            node.page = self
+
+    def nodes(self):
+        for nodes in self.elements.values():
+            for node in nodes:
+                yield node
+                yield from node.nodes()
+
+
+class FakeExecutor(object):
+    # in-process stand-in for a RemoteConnection: answers W3C commands from scripted pages
+
+    w3c = True
+
+    def __init__(self, pages: List[FakePage] = None,
+                 latency: Union[float, Dict[str, float]] = 0.0):
+        self.pages = {page.url: page for page in pages or []}
+        self.page = FakePage('about:blank')
+        self.window = 'main'
+        self.windows: Dict[str, FakePage] = {self.window: self.page}
+        self.latency = latency
+        self.commands = Counter()
+        self.failures: Dict[str, List[str]] = defaultdict(list)
+        self.nodes: Dict[str, FakeNode] = {}
+        self.cookies: List[dict] = []
+        self.cdp: List[Tuple[str, dict]] = []
+        self.actions: List[list] = []
+        self.timeouts: List[dict] = []
+        self.performance: List[List[Tuple[str, dict]]] = []
+        self.local_storage: Dict[str, str] = {}
+        self.session_storage: Dict[str, str] = {}
+        self.scripts: Dict[str, Callable] = {
+            GET_ATTRIBUTE: lambda node, name: node.attributes.get(name),
+            IS_DISPLAYED: lambda node: node.displayed,
+            scripts.FIND_ELEMENTS: self._script_find_elements,
+            scripts.PREFETCH: self._script_prefetch,
+            scripts.WAIT_FOR_DOM: self._script_wait_for_dom,
+            scripts.SETTLE: lambda quiet, timeout: True,
+            scripts.FIND_ELEMENTS_MATCHING: self._script_find_elements_matching,
+            scripts.GET_STORAGE: self._script_get_storage,
+            scripts.SET_STORAGE: self._script_set_storage,
+            scripts.FILL_FORM: self._script_fill_form,
+            scripts.NEW_TAB: self._script_new_tab,
+            scripts.CHECK_CONDITIONS: self._script_check_conditions,
+            scripts.SCROLL_ITEMS: self._script_scroll_items,
+            scripts.COUNT_ELEMENTS: lambda by, value: len(self.find(by, value)),
+            scripts.READY_STATE: lambda: 'complete',
+        }
+        for page in self.pages.values():
+            self._register(page)
+
+    def fail(self, command: str, error: str, times: int = 1):
+        # the next `times` calls of command answer with a w3c error, e.g. 'stale element reference'
+        self.failures[command].extend([error] * times)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.commands.values())
+
+    def _register(self, page: FakePage):
+        for node in page.nodes():
+            self.nodes[node.id] = node
+
+    def _node(self, element: dict) -> FakeNode:
+        node = self.nodes[element[ELEMENT_KEY]]
+        if node.page is not self.page:
+            raise _Error('stale element reference')
+        return node
+
+    def _wrap(self, value):
+        if isinstance(value, FakeNode):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(i) for i in value]
+        if isinstance(value, dict):
+            return {k: self._wrap(v) for k, v in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict) and ELEMENT_KEY in value:
+            return self._node(value)
+        if isinstance(value, list):
+            return [self._unwrap(i) for i in value]
+        return value
+
+    def find(self, by: str, value: str, root: FakeNode = None) -> List[FakeNode]:
+        elements = self.page.elements if root is None else root.children
+        return list(elements.get(normalize(by, value), []))
+
+    def execute(self, command: str, params: dict) -> dict:
+        self.commands[command] += 1
+        latency = self.latency.get(command, 0.0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if self.failures[command]:
+            error = self.failures[command].pop(0)
+            return {'status': error, 'message': error, 'value': {'message': error}}
+
+        try:
+            value = getattr(self, '_' + command, self._unknown)(params)
+        except _Error as e:
+            return {'status': e.error, 'message': e.error, 'value': {'message': e.error}}
+        return {'value': self._wrap(value)}
+
+    def _unknown(self, params):
+        return None
+
+    def _newSession(self, params):
+        return {'sessionId': 'fake', 'capabilities': {'browserName': 'fake'}}
+
+    def load(self, url: str):
+        # elements of the previous page become stale
+        self.page = self.windows[self.window] = self.pages.get(url) or FakePage(url)
+        self.performance = list(self.page.network)
+
+    def _get(self, params):
+        self.load(params['url'])
+
+    def _refresh(self, params):
+        pass
+
+    def _getCurrentUrl(self, params):
+        return self.page.url
+
+    def _getPageSource(self, params):
+        return self.page.source
+
+    def _findElement(self, params):
+        nodes = self._findElements(params)
+        if not nodes:
+            raise _Error('no such element')
+        return nodes[0]
+
+    def _findElements(self, params):
+        return self.find(params['using'], params['value'])
+
+    def _findChildElement(self, params):
+        nodes = self._findChildElements(params)
+        if not nodes:
+            raise _Error('no such element')
+        return nodes[0]
+
+    def _findChildElements(self, params):
+        return self.find(params['using'], params['value'], self._node({ELEMENT_KEY: params['id']}))
+
+    def _getElementText(self, params):
+        return self._node({ELEMENT_KEY: params['id']}).visible_text
+
+    def _isElementEnabled(self, params):
+        return self._node({ELEMENT_KEY: params['id']}).enabled
+
+    def _isElementSelected(self, params):
+        return self._node({ELEMENT_KEY: params['id']}).selected
+
+    def _clickElement(self, params):
+        node = self._node({ELEMENT_KEY: params['id']})
+        if node.on_click is not None:
+            node.on_click(self)
+
+    def _clearElement(self, params):
+        self._node({ELEMENT_KEY: params['id']}).attributes['value'] = ''
+
+    def _sendKeysToElement(self, params):
+        node = self._node({ELEMENT_KEY: params['id']})
+        node.attributes['value'] = node.attributes.get('value', '') + params['text']
+
+    def _w3cExecuteScript(self, params):
+        handler = self.scripts.get(params['script'])
+        if handler is None:
+            return None
+        return handler(*self._unwrap(params['args']))
+
+    _w3cExecuteScriptAsync = _w3cExecuteScript
+
+    def _w3cGetWindowHandles(self, params):
+        return list(self.windows)
+
+    def _w3cGetCurrentWindowHandle(self, params):
+        return self.window
+
+    def _switchToWindow(self, params):
+        if params['handle'] not in self.windows:
+            raise _Error('no such window')
+        self.window = params['handle']
+        self.page = self.windows[self.window]
+
+    def _close(self, params):
+        # like a browser, the session has no current window until the next switch
+        self.windows.pop(self.window, None)
+        self.page = FakePage('about:blank')
+
+    def _setTimeouts(self, params):
+        self.timeouts.append(params)
+
+    def _actions(self, params):
+        self.actions.append(params['actions'])
+
+    def _getCookies(self, params):
+        return list(self.cookies)
+
+    def _addCookie(self, params):
+        self.cookies.append(params['cookie'])
+
+    def _deleteAllCookies(self, params):
+        self.cookies = []
+
+    def _executeCdpCommand(self, params):
+        cmd, cmd_params = params['cmd'], params['params']
+        self.cdp.append((cmd, cmd_params))
+        if cmd == 'Network.getAllCookies':
+            return {'cookies': [dict(i, expires=i.get('expiry', -1)) for i in self.cookies]}
+        elif cmd == 'Network.setCookies':
+            self.cookies.extend(cmd_params['cookies'])
+        elif cmd == 'Page.addScriptToEvaluateOnNewDocument':
+            return {'identifier': str(len(self.cdp))}
+        return {}
+
+    def _getLog(self, params):
+        if params.get('type') != 'performance' or not self.performance:
+            return []
+        return [{'level': 'INFO', 'timestamp': int(time.time() * 1000),
+                 'message': json.dumps({'message': {'method': method, 'params': event}})}
+                for method, event in self.performance.pop(0)]
+
+    def _script_find_elements(self, by, value, root, names):
+        return [[node, node.visible_text, {name: node.attributes.get(name) for name in names}]
+                for node in self.find(by, value, root)]
+
+    def _script_prefetch(self, nodes, names):
+        return [[node.visible_text, {name: node.attributes.get(name) for name in names}] for node in nodes]
+
+    def _script_find_elements_matching(self, by, value, root, text, match, ignore_case):
+        if match == 'regex':
+            regex = re.compile(text, re.IGNORECASE if ignore_case else 0)
+            test = lambda s: regex.search(s) is not None
+        else:
+            text = text.lower() if ignore_case else text
+            test = lambda s: text in s if match == 'contains' else s == text
+        return [[node, node.visible_text] for node in self.find(by, value, root)
+                if test(node.visible_text.lower() if ignore_case and match != 'regex' else node.visible_text)]
+
+    def _script_get_storage(self):
+        parts = urlsplit(self.page.url)
+        return {'url': self.page.url, 'origin': f'{parts.scheme}://{parts.netloc}',
+                'local': dict(self.local_storage), 'session': dict(self.session_storage)}
+
+    def _script_set_storage(self, local, session):
+        self.local_storage.update(local)
+        self.session_storage.update(session)
+
+    def _script_fill_form(self, fields, verify):
+        # values are kept as given; a maxlength attribute truncates them like a browser would
+        nodes = [node or next(iter(self.find(by, value)), None) for node, by, value, _ in fields]
+        missing = [i for i, node in enumerate(nodes) if node is None]
+        if missing:
+            return {'missing': missing, 'mismatched': []}
+        mismatched = []
+        for i, (node, field) in enumerate(zip(nodes, fields)):
+            # like the value setter and String(value) of the script, null is set as '' but compared as 'null'
+            value = '' if field[3] is None else field[3]
+            expected = 'null' if field[3] is None else field[3]
+            if 'maxlength' in node.attributes and isinstance(value, str):
+                value = value[:int(node.attributes['maxlength'])]
+            node.attributes['value'] = value
+            if verify and value != expected:
+                mismatched.append([i, value])
+        return {'missing': [], 'mismatched': mismatched}
+
+    def _script_new_tab(self):
+        self.windows[f'tab-{next(_ids)}'] = FakePage('about:blank')
+
+    def _script_check_conditions(self, checks):
+        found = []
+        for kind, by, value, text in checks:
+            nodes = self.find(by, value)
+            if kind in ('present', 'absent'):
+                found.append(bool(nodes) is (kind == 'present'))
+            elif not nodes:
+                found.append(False)
+            else:
+                s = nodes[0].visible_text.strip()
+                found.append({'is_in': text in s, 'not_in': text not in s,
+                              'equal': s == text, 'not_equal': s != text}[kind])
+        return found
+
+    def _script_scroll_items(self, by, value, offset, names):
+        nodes = self.find(by, value)
+        offset = offset if offset <= len(nodes) else 0
+        found = {'offset': offset, 'total': len(nodes),
+                 'items': self._script_find_elements(by, value, None, names)[offset:]}
+        if self.page.on_scroll is not None:
+            self.page.on_scroll(self)
+        return found
+
+    def _script_wait_for_dom(self, conditions, timeout):
+        return all(bool(self.find(by, value)) is present for by, value, present in conditions)
+
+
+class _Error(Exception):
+    def __init__(self, error: str):
+        super().__init__(error)
+        self.error = error
+
+
+class FakeBrowser(Browser):
+    # new_session starts over on a fresh fake driver with the same pages
+    pages: List[FakePage]
+    latency: Union[float, Dict[str, float]]
+
+    def new_session(self):
+        self.quit()
+        self._invalidate_page_cache()
+        self.wait_page_loading = True
+        self.driver = webdriver.Remote(command_executor=FakeExecutor(self.pages, latency=self.latency),
+                                       desired_capabilities={})
+        self.init_after_browser()
+        self.driver.command_executor.commands.clear()
+
+
+def fake_browser(pages: List[FakePage] = None, latency: Union[float, Dict[str, float]] = 0.0,
+                 settings: Settings = None) -> FakeBrowser:
+    settings = Settings(settle=True) if settings is None else settings
+    browser = FakeBrowser(settings)
+    browser.settings.driver_name = 'fake'
+    browser.pages = pages or []
+    browser.latency = latency
+    browser.new_session()
+    return browser
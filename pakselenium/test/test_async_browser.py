@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+from pakselenium import AsyncBrowser, Browser
+
+
+def test_runs_off_loop(monkeypatch):
+    threads = []
+    monkeypatch.setattr(Browser, 'is_on_page', lambda self, selector: threads.append(threading.get_ident()) or True)
+
+    async def main():
+        async with AsyncBrowser() as browser:
+            assert await browser.is_on_page(None)
+            assert await browser.is_on_page(None)
+
+    asyncio.run(main())
+    assert len(set(threads)) == 1
+    assert threads[0] != threading.get_ident()
+
+
+def test_trailing_sleep(monkeypatch):
+    calls = []
+    monkeypatch.setattr(Browser, 'move_cursor', lambda self, selector, sleep=0.5: calls.append(sleep))
+    monkeypatch.setattr(Browser, 'close', lambda self: None)
+
+    async def main():
+        browsers = [AsyncBrowser() for _ in range(5)]
+        tt = time.time()
+        await asyncio.gather(*[i.move_cursor(None, sleep=0.2) for i in browsers])
+        for i in browsers:
+            await i.close()
+        return time.time() - tt
+
+    assert asyncio.run(main()) < 0.5
+    assert calls == [0] * 5
+
+
+def test_iter_pages(monkeypatch):
+    threads = []
+
+    def iter_pages(self, item, next_page):
+        for i in range(3):
+            threads.append(threading.get_ident())
+            yield [i]
+
+    monkeypatch.setattr(Browser, 'iter_pages', iter_pages)
+    monkeypatch.setattr(Browser, 'close', lambda self: None)
+
+    async def main():
+        async with AsyncBrowser() as browser:
+            return [batch async for batch in browser.iter_pages(None, None)]
+
+    assert asyncio.run(main()) == [[0], [1], [2]]
+    assert threading.get_ident() not in threads
+
+
+def test_settle_signature(monkeypatch):
+    calls = []
+    monkeypatch.setattr(Browser, 'settle', lambda self, timeout, quiet=None, desc=None: calls.append((timeout, quiet)))
+    monkeypatch.setattr(Browser, 'close', lambda self: None)
+
+    async def main():
+        async with AsyncBrowser() as browser:
+            await browser.settle(2, quiet=0.5)
+
+    asyncio.run(main())
+    assert calls == [(2, 0.5)]
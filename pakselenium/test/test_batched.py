@@ -0,0 +1,38 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from pakselenium import Selector, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+URL = 'https://example.com'
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+LINKS = Selector(By.TAG_NAME, 'a')
+
+
+@pytest.fixture
+def browser():
+    rows = [FakeNode('first', children={LINKS.locator: [FakeNode('a', {'href': '/a'}), FakeNode('b', {'href': '/b'})]}),
+            FakeNode('second')]
+    browser = fake_browser([FakePage(URL, {ROWS.locator: rows})])
+    browser.go(URL, sleep=0)
+    return browser
+
+
+def test_batched(browser):
+    pes = browser.find_elements_batched(ROWS, attributes=['href'])
+    assert [(i.text, i.selector, i.index) for i in pes] == [('first', ROWS, 0), ('second', ROWS, 1)]
+    assert pes[0].get_attribute('href') is None
+
+
+def test_batched_from_element(browser):
+    first, second = browser.find_elements_batched(ROWS)
+    links = browser.find_elements_batched(LINKS, attributes=['href'], from_pe=first)
+    assert [(i.text, i.get_attribute('href')) for i in links] == [('a', '/a'), ('b', '/b')]
+    assert all(i.root is first for i in links)
+    # inside an element an empty result is not an error
+    assert browser.find_elements_batched(LINKS, from_pe=second) == []
+
+
+def test_batched_missing(browser):
+    with pytest.raises(NoSuchElementException):
+        browser.find_elements_batched(Selector(By.CSS_SELECTOR, '.missing'))
@@ -0,0 +1,39 @@
+from pakselenium import Selector, By, TextCondition
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+URL = 'https://example.com'
+TITLE = Selector(By.CSS_SELECTOR, 'h1')
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+SPINNER = Selector(By.CSS_SELECTOR, '.spinner')
+EMPTY = Selector(By.CSS_SELECTOR, '.empty')
+
+
+def browser():
+    browser = fake_browser([FakePage(URL, {TITLE.locator: [FakeNode('Results: 3')],
+                                           ROWS.locator: [FakeNode('row')]})])
+    browser.go(URL, sleep=0)
+    browser.driver.command_executor.commands.clear()
+    return browser
+
+
+def test_check_conditions():
+    b = browser()
+    until = [ROWS, TextCondition.is_in(TITLE, 'Results'), TextCondition.equal(TITLE, 'x')]
+    matched = b.check_conditions(until=until, until_lost=[SPINNER, ROWS], empty=EMPTY)
+    assert matched.until == [True, True, False]
+    assert matched.until_lost == [True, False]
+    assert not matched.empty and not matched.reload and not matched.reached
+    assert b.driver.command_executor.round_trips == 1
+
+
+def test_is_reached_page_one_round_trip():
+    b = browser()
+    assert b.is_reached_page([ROWS, TITLE, TextCondition.not_equal(TITLE, '')], [SPINNER, EMPTY], EMPTY, None)
+    assert b.driver.command_executor.round_trips == 1
+
+
+def test_callables_are_still_called():
+    b = browser()
+    calls = []
+    assert b.is_reached_page([ROWS, lambda: calls.append(1) or True], None, lambda: calls.append(2), None)
+    assert calls == [2, 1]
@@ -0,0 +1,46 @@
+from selenium.common.exceptions import WebDriverException
+
+from pakselenium import Browser, Selector, Settings, By
+from pakselenium.crawl import Crawler
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+TITLE = Selector(By.CSS_SELECTOR, 'h1')
+URLS = [f'https://example.com/{i}' for i in range(20)]
+PAGES = [FakePage(url, {TITLE.locator: [FakeNode(f'title {i}')]}) for i, url in enumerate(URLS)]
+FLAKY = 'https://example.com/flaky'
+
+_failed = set()
+
+
+def factory(settings: Settings) -> Browser:
+    return fake_browser(PAGES + [FakePage(FLAKY, {TITLE.locator: [FakeNode('flaky')]})], settings=settings)
+
+
+def extract(browser: Browser, url: str) -> str:
+    # fails once per worker for the flaky page, always for unknown pages
+    if url == FLAKY and url not in _failed:
+        _failed.add(url)
+        raise WebDriverException('session lost')
+    return browser.find_element(TITLE).text
+
+
+def test_crawl():
+    crawler = Crawler(Settings(settle=True), extract, processes=2, in_flight=3, factory=factory, sleep=0)
+    results = {i.url: i for i in crawler.run(URLS + [FLAKY, 'https://example.com/missing'])}
+    assert len(results) == 22
+    assert all(results[url].value == f'title {i}' for i, url in enumerate(URLS))
+    assert results[FLAKY].ok and results[FLAKY].attempts == 2
+    assert not results['https://example.com/missing'].ok
+    assert results['https://example.com/missing'].attempts == 2
+    assert sum(i.pages for i in crawler.stats.values()) == 21
+    assert sum(i.failures for i in crawler.stats.values()) == 1
+    assert sum(i.retries for i in crawler.stats.values()) == 2
+
+
+def test_crawl_stopped_early():
+    crawler = Crawler(Settings(settle=True), extract, processes=1, in_flight=2, factory=factory, sleep=0)
+    results = crawler.run(URLS)
+    assert next(results).ok
+    # the urls still queued are cancelled, the worker is shut down
+    results.close()
+    assert sum(i.pages for i in crawler.stats.values()) < len(URLS)
@@ -0,0 +1,78 @@
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pakselenium.utils import catch
+from pakselenium.utils import instrument
+
+
+class Driver(object):
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+
+@instrument.instrument_methods
+class Owner(object):
+    def __init__(self):
+        self.driver = Driver()
+        instrument.count_round_trips(self.driver)
+        self.stale = 1
+
+    def outer(self):
+        self.inner()
+        self.driver.execute('get')
+        instrument.sleep(0.001)
+
+    @instrument.waits
+    def inner(self):
+        self.driver.execute('findElement')
+
+    def pages(self, n: int):
+        for i in range(n):
+            self.driver.execute('findElements')
+            yield i
+
+    @catch.staleElementReferenceException(sleep=0)
+    def retried(self):
+        if self.stale:
+            self.stale -= 1
+            raise StaleElementReferenceException
+
+
+def test_no_subscribers():
+    Owner().outer()
+
+
+def test_profiler():
+    owner = Owner()
+    with instrument.Profiler() as profiler:
+        owner.outer()
+        owner.retried()
+    owner.outer()
+
+    outer, = profiler.calls['Owner.outer']
+    inner, = profiler.calls['Owner.inner']
+    retried, = profiler.calls['Owner.retried']
+    assert outer.round_trips == 2
+    assert inner.round_trips == 1
+    assert outer.sleep >= 0.001
+    assert 0 < inner.wait <= outer.wall
+    assert retried.retries == 1
+    assert 'Owner.outer: calls=1' in profiler.report()
+
+
+def test_generator_steps():
+    owner = Owner()
+    with instrument.Profiler() as profiler:
+        pages = owner.pages(3)
+        assert not profiler.calls
+        for _ in pages:
+            # the caller's work between steps is not part of the call
+            owner.driver.execute('get')
+            time.sleep(0.01)
+        assert list(owner.pages(0)) == []
+
+    call, empty = profiler.calls['Owner.pages']
+    assert call.round_trips == 3
+    assert call.wall < 0.01
+    assert empty.round_trips == 0
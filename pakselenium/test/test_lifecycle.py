@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+
+import pytest
+
+from selenium import webdriver
+
+from pakselenium import Browser, Settings, lifecycle
+from pakselenium.test.fake_driver import FakePage, fake_browser
+
+COOKIE = {'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/'}
+
+
+class Process(object):
+    def __init__(self, pid: int, rss: int, children: list = ()):
+        self.pid = pid
+        self.rss = rss
+        self.children_ = list(children)
+        self.killed = False
+
+    def children(self, recursive: bool = False):
+        return self.children_
+
+    def memory_info(self):
+        return SimpleNamespace(rss=self.rss)
+
+    def kill(self):
+        self.killed = True
+
+
+def fake_psutil(root: Process):
+    return SimpleNamespace(Process=lambda pid: root, NoSuchProcess=LookupError,
+                           wait_procs=lambda processes, timeout: ([], [i for i in processes if i.pid == 3]))
+
+
+def test_recycle_by_pages():
+    pages = [FakePage(f'https://example.com/{i}') for i in range(3)]
+    browser = fake_browser(pages, settings=Settings(settle=True, recycle_pages=2))
+    browser.go(pages[0].url, sleep=0)
+    executor = browser.driver.command_executor
+    executor.cookies.append(dict(COOKIE))
+    browser.go(pages[1].url, sleep=0)
+    assert browser.lifecycle.pages == 2
+
+    browser.go(pages[2].url, sleep=0)
+    assert executor.commands['quit'] == 1
+    assert browser.driver.command_executor is not executor
+    assert browser.driver.command_executor.cookies == [COOKIE]
+    assert browser.lifecycle.pages == 1
+    assert browser.current_url == pages[2].url
+
+
+def test_quit():
+    browser = fake_browser()
+    executor = browser.driver.command_executor
+    browser.quit()
+    assert executor.commands['quit'] == 1
+    assert browser.driver is None and browser.lifecycle is None
+    browser.quit()
+    assert executor.commands['quit'] == 1
+
+
+def test_quit_kills_leftovers(monkeypatch):
+    root = Process(1, 100, [Process(2, 200), Process(3, 300)])
+    monkeypatch.setattr(lifecycle, 'psutil', fake_psutil(root))
+    browser = fake_browser(settings=Settings(settle=True, recycle_rss=1))
+    browser.driver.service = SimpleNamespace(process=root)
+    assert browser.lifecycle.rss() == 600
+    browser.quit()
+    assert [i.killed for i in [root] + root.children_] == [False, False, True]
+
+
+def test_recycle_rss_needs_psutil(monkeypatch):
+    monkeypatch.setattr(lifecycle, 'psutil', None)
+    with pytest.raises(ImportError):
+        fake_browser(settings=Settings(settle=True, recycle_rss=1000))
+
+
+def test_psutil_checked_before_driver_starts(monkeypatch):
+    started = []
+    monkeypatch.setattr(lifecycle, 'psutil', None)
+    monkeypatch.setattr(webdriver, 'Chrome', lambda **kwargs: started.append(kwargs))
+    with pytest.raises(ImportError):
+        Browser(Settings(recycle_rss=1000)).init_chrome('chromedriver')
+    assert started == []
+
+
+def test_recycle_rss_needs_own_service(monkeypatch):
+    started = []
+    monkeypatch.setattr(lifecycle, 'psutil', fake_psutil(Process(1, 100)))
+    monkeypatch.setattr(webdriver, 'Chrome', lambda **kwargs: started.append(kwargs))
+    with pytest.raises(ValueError):
+        Browser(Settings(recycle_rss=1000, shared_service=True)).init_chrome('chromedriver')
+    assert started == []
+
+
+def test_refresh_counted():
+    page = FakePage('https://example.com/0')
+    browser = fake_browser([page])
+    reloads = iter([True, False])
+    browser.go(page.url, reload=lambda: next(reloads), sleep=0)
+    assert browser.lifecycle.pages == 2
+    attempts = iter([False, True])
+    # a page that is not reached is refreshed and then opened again
+    browser.go(page.url, until=lambda: next(attempts), sleep=0, timeout=0)
+    assert browser.lifecycle.pages == 5
+    browser.refresh(sleep=0)
+    assert browser.lifecycle.pages == 6
+
+
+def test_driver_without_lifecycle():
+    page = FakePage('https://example.com/0')
+    browser = fake_browser([page])
+    browser.lifecycle = None
+    browser.go(page.url, sleep=0)
+
+
+def test_recycle_postponed_while_tabs_open():
+    pages = [FakePage(f'https://example.com/{i}') for i in range(4)]
+    browser = fake_browser(pages, settings=Settings(settle=True, recycle_pages=2))
+    executor = browser.driver.command_executor
+    main = browser.current_tab()
+    tab = browser.new_tab(pages[0].url)
+    assert browser.lifecycle.pages == 1
+    for page in pages[1:]:
+        main.go(page.url, sleep=0)
+    assert executor.commands['quit'] == 0
+    assert tab.current_url == pages[0].url
+
+    tab.close()
+    main.go(pages[0].url, sleep=0)
+    assert executor.commands['quit'] == 1
+    # the Tab of the only window goes on in the new session
+    main.go(pages[1].url, sleep=0)
+    assert main.current_url == pages[1].url
+    assert browser.tabs == [main]
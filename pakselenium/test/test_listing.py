@@ -0,0 +1,54 @@
+from pakselenium import Selector, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+from pakselenium.utils.dedupe import Seen
+
+URL = 'https://example.com/list'
+ITEMS = Selector(By.CSS_SELECTOR, '.item')
+NEXT = Selector(By.CSS_SELECTOR, '.next')
+
+
+def page(n: int, items: list, last: bool = False) -> FakePage:
+    url = f'{URL}?page={n}'
+    next_page = FakeNode('next', enabled=not last, on_click=lambda executor: executor.load(f'{URL}?page={n + 1}'))
+    return FakePage(url, {ITEMS.locator: [FakeNode(i, {'href': f'/{i}'}) for i in items], NEXT.locator: [next_page]})
+
+
+def test_seen_is_bounded():
+    seen = Seen(size=3)
+    assert seen.new(['a', 'b', 'a', {'c': 1}]) == ['a', 'b', {'c': 1}]
+    assert seen.new(['d', 'a']) == ['d']
+    assert len(seen) == 3
+    assert seen.new(['b']) == ['b']
+
+
+def test_iter_pages():
+    pages = [page(1, ['a', 'b']), page(2, ['b', 'c']), page(3, ['d'], last=True)]
+    browser = fake_browser(pages)
+    browser.go(pages[0].url, sleep=0)
+    batches = list(browser.iter_pages(ITEMS, NEXT, lambda pe: pe.get_attribute('href'), attributes=['href'],
+                                      sleep=0, timeout=1))
+    assert batches == [['/a', '/b'], ['/c'], ['/d']]
+    # the first item is checked with the in-page text() its text was read with, not WebElement.text
+    assert browser.driver.command_executor.commands['getElementText'] == 0
+
+
+def test_iter_pages_ends_on_repeated_page():
+    pages = [page(1, ['a', 'b']), page(2, ['a', 'b'])]
+    browser = fake_browser(pages)
+    browser.go(pages[0].url, sleep=0)
+    assert list(browser.iter_pages(ITEMS, NEXT, sleep=0, timeout=1)) == [['a', 'b']]
+
+
+def test_iter_scroll():
+    nodes = [FakeNode(f'row {i}') for i in range(10)]
+
+    def load_more(executor):
+        if len(nodes) < 30:
+            nodes.extend(FakeNode(f'row {i}') for i in range(len(nodes), len(nodes) + 10))
+            executor._register(executor.page)
+
+    browser = fake_browser([FakePage(URL, {ITEMS.locator: nodes}, on_scroll=load_more)])
+    browser.go(URL, sleep=0)
+    batches = list(browser.iter_scroll(ITEMS, idle=0.05))
+    assert [len(i) for i in batches] == [10, 10, 10]
+    assert batches[2][-1] == 'row 29'
@@ -0,0 +1,48 @@
+import re
+
+from pakselenium.test.fake_driver import fake_browser
+from pakselenium.utils import loading
+from pakselenium.utils.loading import LoadProfile
+
+
+def test_blocked_urls():
+    assert LoadProfile().blocked_urls == []
+    assert LoadProfile(images=True, patterns=['*/ads/*']).blocked_urls == loading.IMAGES + ['*/ads/*']
+    assert set(loading.LEAN.blocked_urls) >= set(loading.FONTS + loading.ANALYTICS)
+
+
+def is_blocked(url: str, patterns) -> bool:
+    # Network.setBlockedURLs: '*' is the only wildcard
+    return any(re.fullmatch('.*'.join(map(re.escape, i.split('*'))), url) for i in patterns)
+
+
+def test_query_strings():
+    images = loading.IMAGES
+    assert is_blocked('https://cdn.example.com/a/x.png', images)
+    assert is_blocked('https://cdn.example.com/a/x.png?v=1', images)
+    assert is_blocked('https://cdn.example.com/font.woff2?display=swap', loading.FONTS)
+    assert not is_blocked('https://example.com/gallery.pngs', images)
+    assert not is_blocked('https://example.com/page?img=1', images)
+
+
+def test_go_switches_profile_on_change():
+    browser = fake_browser()
+    cdp = browser.driver.command_executor.cdp
+    browser.go('https://example.com', sleep=0)
+    assert cdp == []
+
+    browser.go('https://example.com', sleep=0, load_profile=loading.LEAN)
+    browser.go('https://example.com', sleep=0, load_profile=loading.LEAN)
+    assert cdp == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': loading.LEAN.blocked_urls})]
+
+    browser.go('https://example.com', sleep=0)
+    assert cdp[-1] == ('Network.setBlockedURLs', {'urls': []})
+    assert len(cdp) == 3
+
+
+def test_go_uses_settings_profile_set_later():
+    browser = fake_browser()
+    cdp = browser.driver.command_executor.cdp
+    browser.settings.load_profile = loading.LEAN
+    browser.go('https://example.com', sleep=0)
+    assert cdp == [('Network.enable', {}), ('Network.setBlockedURLs', {'urls': loading.LEAN.blocked_urls})]
@@ -0,0 +1,36 @@
+import logging
+
+import pytest
+
+from pakselenium import config, log
+from pakselenium.utils.logs import logf, logger
+
+
+@pytest.fixture
+def records(monkeypatch):
+    found = []
+    handler = logging.Handler()
+    handler.emit = found.append
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    monkeypatch.setattr(config, 'debug_verbose', 2)
+    yield found
+    logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+
+
+def test_positional_min_verbose(records):
+    log('100% loaded', 1)
+    log('details', 3)
+    assert [(i.getMessage(), i.levelno) for i in records] == [('100% loaded', logging.INFO)]
+
+
+def test_lazy_args(records):
+    logf('[go:"%s"]: %s', 'url', 'desc', min_verbose=1)
+    logf('[go]: %s' if None else None, 'desc')
+    assert [i.getMessage() for i in records] == ['[go:"url"]: desc']
+
+
+def test_no_output_by_default(capsys):
+    logf('[go]: %s', 'desc', min_verbose=1)
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,37 @@
+from pakselenium import Settings
+from pakselenium.test.fake_driver import FakePage, fake_browser
+from pakselenium.utils.poll import PollPolicy
+
+URL = 'https://example.com'
+
+
+def sent(request_id: str, url: str, resource: str) -> tuple:
+    return 'Network.requestWillBeSent', {'requestId': request_id, 'type': resource, 'request': {'url': url}}
+
+
+def finished(request_id: str) -> tuple:
+    return 'Network.loadingFinished', {'requestId': request_id}
+
+
+def test_go_until_network_idle():
+    network = [
+        [sent('1', URL, 'Document'), sent('2', URL + '/api', 'XHR'), sent('3', URL + '/a.png', 'Image'),
+         sent('4', 'https://www.google-analytics.com/collect', 'XHR')],
+        [finished('1')],
+        [],
+        [finished('2')],
+    ]
+    settings = Settings(settle=True, track_network=True, poll_policy=PollPolicy(interval=0.001))
+    browser = fake_browser([FakePage(URL, network=network)], settings=settings)
+    browser.go(URL, until_network_idle=10, timeout=5)
+    assert browser.network.in_flight == {}
+    assert browser.network.finished == 2
+    assert browser.driver.command_executor.commands['getLog'] >= 5
+
+
+def test_network_idle_timeout():
+    settings = Settings(settle=True, track_network=True, poll_policy=PollPolicy(interval=0.001))
+    browser = fake_browser([FakePage(URL, network=[[sent('1', URL + '/api', 'Fetch')]])], settings=settings)
+    browser.driver.get(URL)
+    assert not browser.wait_network_idle(10, timeout=0.05)
+    assert list(browser.network.in_flight) == ['1']
@@ -0,0 +1,155 @@
+from typing import List
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pakselenium import PageElement, Selector, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+from pakselenium.utils.poll import PollPolicy
+
+URL = 'https://example.com/list'
+ROWS = Selector(By.CSS_SELECTOR, '.row', desc='rows')
+LINK = Selector(By.CSS_SELECTOR, 'a', desc='link')
+
+
+class Element(object):
+    def __init__(self, text: str, attributes: dict):
+        self._text = text
+        self.attributes = attributes
+        self.calls = 0
+
+    @property
+    def text(self):
+        self.calls += 1
+        return self._text
+
+    def get_attribute(self, name):
+        self.calls += 1
+        return self.attributes.get(name)
+
+
+def test_lazy():
+    element = Element(' text ', {'href': '/'})
+    pe = PageElement(element)
+    assert element.calls == 0
+    assert pe.text == 'text'
+    assert pe.text == 'text'
+    assert pe.get_attribute('href') == '/'
+    assert pe.get_attribute('href') == '/'
+    assert element.calls == 2
+
+
+def test_refresh():
+    element = Element('old', {})
+    pe = PageElement(element)
+    assert pe.text == 'old'
+    element._text = 'new'
+    assert pe.text == 'old'
+    pe.refresh()
+    assert pe.text == 'new'
+
+
+def test_prefetched():
+    element = Element('live', {'href': '/live'})
+    pe = PageElement(element, text='cached', attributes={'href': '/cached'})
+    assert pe.text == 'cached'
+    assert pe.get_attribute('href') == '/cached'
+    assert element.calls == 0
+
+
+def rerender(executor, url: str, rows: List[str]):
+    # the page keeps its url but every node is replaced, so old references go stale
+    page = FakePage(url, {ROWS.locator: [FakeNode(i, children={LINK.locator: [FakeNode(i + ' link')]})
+                                         for i in rows]})
+    executor.pages[url] = page
+    executor._register(page)
+    executor.load(url)
+
+
+def test_stale_resolved():
+    browser = fake_browser()
+    executor = browser.driver.command_executor
+    rerender(executor, URL, ['a', 'b'])
+    pe = browser.find_elements(ROWS)[1]
+    link = browser.find_element_from(pe, LINK)
+    rerender(executor, URL, ['c', 'd'])
+    executor.commands.clear()
+    assert pe.text == 'd'
+    assert executor.commands['findElements'] == 1
+    assert link.text == 'd link'
+
+
+def test_stale_gone():
+    browser = fake_browser()
+    executor = browser.driver.command_executor
+    rerender(executor, URL, ['a', 'b'])
+    pe = browser.find_elements(ROWS)[1]
+    rerender(executor, URL, ['c'])
+    with pytest.raises(StaleElementReferenceException):
+        pe.click()
+
+
+def test_stale_bounded(monkeypatch):
+    monkeypatch.setattr(PageElement, 'policy', PollPolicy(interval=0))
+    browser = fake_browser()
+    executor = browser.driver.command_executor
+    rerender(executor, URL, ['a'])
+    pe = browser.find_element(ROWS)
+    executor.fail('getElementText', 'stale element reference', times=PageElement.retries + 1)
+    with pytest.raises(StaleElementReferenceException):
+        pe.text
+    assert executor.commands['findElements'] == PageElement.retries
+
+
+def paged_links(clicked: List[str]):
+    # Next on the first page opens the second one, which has another link before its Next
+    def link(text: str, url: str = None):
+        def on_click(executor):
+            clicked.append(text)
+            if url is not None:
+                executor.load(url)
+        return FakeNode(text, on_click=on_click)
+
+    return [FakePage(URL, {LINK.locator: [link('Prev'), link('Next', URL + '?page=2')]}),
+            FakePage(URL + '?page=2', {LINK.locator: [link('Home'), link('Delete account'), link('Next')]})]
+
+
+def test_stale_resolved_by_text():
+    clicked = []
+    browser = fake_browser(paged_links(clicked))
+    browser.go(URL, sleep=0)
+    pe = browser.find_elements_with_text(LINK, 'Next')[0]
+    pe.click()
+    pe.click()
+    assert clicked == ['Next', 'Next']
+
+
+def test_click_after_navigation():
+    clicked = []
+    browser = fake_browser(paged_links(clicked))
+    browser.go(URL, sleep=0)
+    browser.click(LINK, element_text='Next', sleep=0)
+    browser.click(LINK, element_text='Next', sleep=0)
+    assert clicked == ['Next', 'Next']
+
+
+def test_actions_after_navigation():
+    clicked = []
+    browser = fake_browser(paged_links(clicked))
+    browser.go(URL, sleep=0)
+    browser.wait_until_clickable(LINK, element_text='Next').click()
+    element = browser.actions()._element(LINK, 'Next')
+    assert element.text == 'Next'
+    assert browser.driver.command_executor.page.url == URL + '?page=2'
+
+
+def test_hidden_duplicate_skipped():
+    # a hidden mobile copy of the menu comes first in the document
+    clicked = []
+    menu = [FakeNode('Next', displayed=False, on_click=lambda executor: clicked.append('hidden')),
+            FakeNode('Prev'), FakeNode('Next', on_click=lambda executor: clicked.append('visible'))]
+    browser = fake_browser([FakePage(URL, {LINK.locator: menu})])
+    browser.go(URL, sleep=0)
+    assert [i.text for i in browser.find_elements_batched(LINK)] == [i.text for i in browser.find_elements(LINK)]
+    browser.click(LINK, element_text='Next', sleep=0, timeout=1)
+    assert clicked == ['visible']
@@ -0,0 +1,48 @@
+from itertools import islice
+
+import pytest
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+from pakselenium.utils import catch
+from pakselenium.utils.poll import PollPolicy, PolicyWait, intervals
+
+
+def test_fixed():
+    assert list(islice(PollPolicy().intervals(), 3)) == [0.5, 0.5, 0.5]
+    assert list(islice(intervals(1), 2)) == [1, 1]
+
+
+def test_backoff():
+    policy = PollPolicy(interval=0.1, factor=2.0, max_interval=0.5, burst=2, burst_interval=0.01)
+    assert list(islice(policy.intervals(), 7)) == pytest.approx([0.01, 0.01, 0.1, 0.2, 0.4, 0.5, 0.5])
+
+
+def test_jitter():
+    policy = PollPolicy(interval=1.0, jitter=0.2)
+    assert all(0.8 <= i <= 1.2 for i in islice(policy.intervals(), 100))
+
+
+def test_policy_wait():
+    calls = []
+    wait = PolicyWait(None, 1.0, PollPolicy(interval=0.001))
+    assert wait.until(lambda driver: calls.append(1) or len(calls) >= 3)
+    with pytest.raises(TimeoutException):
+        PolicyWait(None, 0.01, PollPolicy(interval=0.001)).until(lambda driver: False)
+    assert not wait.until_not(lambda driver: False)
+
+
+def test_catch_policy():
+    calls = []
+
+    class Owner(object):
+        settings = type('Settings', (), {'poll_policy': PollPolicy(interval=0.001)})
+
+        @catch.staleElementReferenceException(sleep=None)
+        def method(self):
+            calls.append(1)
+            if len(calls) < 3:
+                raise StaleElementReferenceException
+            return True
+
+    assert Owner().method() is True
+    assert len(calls) == 3
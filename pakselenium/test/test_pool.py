@@ -0,0 +1,118 @@
+import itertools
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+from pakselenium import Browser, BrowserPool, Settings
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    started = []
+    monkeypatch.setattr(Browser, 'new_session', lambda self: started.append(self))
+    monkeypatch.setattr(Browser, 'close', lambda self: None)
+    return started
+
+
+def test_start(sessions):
+    settings = Settings(driver_name='chrome', driver_kwargs=dict(driver_path='chromedriver'))
+    with BrowserPool(settings, 3) as pool:
+        assert len(sessions) == 3
+        assert pool.idle == 3
+        assert len({id(i.settings) for i in pool.browsers}) == 3
+        assert all(i.settings.driver_kwargs == settings.driver_kwargs for i in pool.browsers)
+
+
+def test_checkout(sessions, monkeypatch):
+    monkeypatch.setattr(Browser, 'is_alive', lambda self: True)
+    pool = BrowserPool(Settings(driver_name='chrome'), 1).start()
+    with pool.browser() as browser:
+        assert pool.idle == 0
+        with pytest.raises(TimeoutException):
+            pool.checkout(timeout=0.01)
+    assert pool.idle == 1
+    assert pool.checkout() is browser
+    assert len(sessions) == 1
+
+
+def test_recycle_on_checkin(sessions, monkeypatch):
+    monkeypatch.setattr(Browser, 'is_alive', lambda self: False)
+    pool = BrowserPool(Settings(driver_name='chrome'), 1).start()
+    with pool.browser() as browser:
+        pass
+    assert sessions == [browser, browser]
+
+
+def test_drop_on_failed_recycle(sessions, monkeypatch):
+    monkeypatch.setattr(Browser, 'is_alive', lambda self: False)
+    pool = BrowserPool(Settings(driver_name='chrome'), 2).start()
+
+    def fail(self):
+        raise WebDriverException('chromedriver is gone')
+
+    monkeypatch.setattr(Browser, 'new_session', fail)
+    with pool.browser():
+        pass
+    assert len(pool.browsers) == 1
+    assert pool.idle == 1
+
+
+def test_close_started_on_failed_start(monkeypatch):
+    started, closed = [], []
+    calls = itertools.count()
+
+    def new_session(self):
+        if next(calls) == 2:
+            raise WebDriverException('no chrome binary')
+        started.append(self)
+
+    monkeypatch.setattr(Browser, 'new_session', new_session)
+    monkeypatch.setattr(Browser, 'close', lambda self: closed.append(self))
+    pool = BrowserPool(Settings(driver_name='chrome'), 3)
+    with pytest.raises(WebDriverException):
+        pool.start()
+    assert closed == started
+    assert pool.browsers == []
+
+
+def test_checkout_without_browsers(sessions, monkeypatch):
+    monkeypatch.setattr(Browser, 'is_alive', lambda self: False)
+    pool = BrowserPool(Settings(driver_name='chrome'), 1).start()
+
+    def fail(self):
+        raise OSError('chrome binary not found')
+
+    monkeypatch.setattr(Browser, 'new_session', fail)
+    with pytest.raises(ValueError):
+        with pool.browser():
+            raise ValueError
+    assert pool.browsers == []
+    with pytest.raises(WebDriverException):
+        pool.checkout()
+
+
+def test_waiting_checkout_woken(sessions, monkeypatch):
+    monkeypatch.setattr(Browser, 'is_alive', lambda self: False)
+    pool = BrowserPool(Settings(driver_name='chrome'), 1).start()
+
+    def fail(self):
+        raise OSError('chrome binary not found')
+
+    monkeypatch.setattr(Browser, 'new_session', fail)
+    browser = pool.checkout()
+    failed = []
+
+    def checkout():
+        try:
+            pool.checkout()
+        except WebDriverException as e:
+            failed.append(e)
+
+    thread = threading.Thread(target=checkout)
+    thread.start()
+    pool.checkin(browser)
+    thread.join(2)
+    assert not thread.is_alive()
+    assert len(failed) == 1
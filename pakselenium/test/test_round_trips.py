@@ -0,0 +1,140 @@
+import pytest
+from selenium.common.exceptions import InvalidElementStateException, NoSuchElementException
+
+from pakselenium import PageElement, Selector, By, Keys
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+URL = 'https://example.com'
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+
+
+@pytest.fixture
+def browser():
+    rows = [FakeNode(f'row {i}', {'href': f'/{i}'}) for i in range(50)]
+    browser = fake_browser([FakePage(URL, {ROWS.locator: rows})])
+    browser.go(URL, sleep=0)
+    browser.driver.command_executor.commands.clear()
+    return browser
+
+
+def round_trips(browser) -> int:
+    return browser.driver.command_executor.round_trips
+
+
+def test_find_elements_is_lazy(browser):
+    pes = browser.find_elements(ROWS)
+    assert round_trips(browser) == 1
+    assert pes[1].text == 'row 1'
+    assert round_trips(browser) == 2
+
+
+def test_find_elements_batched(browser):
+    pes = browser.find_elements_batched(ROWS, attributes=['href'])
+    assert [i.text for i in pes] == [f'row {i}' for i in range(50)]
+    assert pes[7].get_attribute('href') == '/7'
+    assert round_trips(browser) == 1
+
+
+def test_prefetch(browser):
+    pes = PageElement.prefetch(browser.find_elements(ROWS), ['href'])
+    assert pes[3].text == 'row 3'
+    assert pes[3].get_attribute('href') == '/3'
+    assert round_trips(browser) == 2
+
+
+def test_find_elements_with_text(browser):
+    assert [i.text for i in browser.find_elements_with_text(ROWS, 'row 7')] == ['row 7']
+    assert len(browser.find_elements_contains(ROWS, 'row 1')) == 11
+    assert len(browser.find_elements_matching(ROWS, r'^ROW \d$', match='regex', ignore_case=True)) == 10
+    assert round_trips(browser) == 3
+
+
+def test_text_index(browser):
+    index = browser.text_index(ROWS)
+    assert index is browser.text_index(ROWS)
+    assert [i.text for i in index.equal('ROW 3', ignore_case=True)] == ['row 3']
+    assert len(index.contains('row 4')) == 11
+    assert len(index.regex(r'row \d$')) == 10
+    assert round_trips(browser) == 2
+    browser.go(URL, sleep=0)
+    assert index is not browser.text_index(ROWS)
+
+
+def test_fill_form():
+    fields = {Selector(By.NAME, f'field{i}'): f'value {i}' for i in range(30)}
+    code = Selector(By.NAME, 'code')
+    elements = {i.locator: [FakeNode()] for i in fields}
+    elements[code.locator] = [FakeNode(attributes={'maxlength': '4'})]
+    browser = fake_browser([FakePage(URL, elements)])
+    browser.go(URL, sleep=0)
+    executor = browser.driver.command_executor
+    executor.commands.clear()
+
+    browser.fill_form(fields, verify=True, sleep=0)
+    assert round_trips(browser) == 1
+    assert browser.find_element(Selector(By.NAME, 'field29')).get_attribute('value') == 'value 29'
+
+    with pytest.raises(InvalidElementStateException):
+        browser.fill_form({code: '123456'}, verify=True, sleep=0)
+    with pytest.raises(NoSuchElementException):
+        browser.fill_form({Selector(By.NAME, 'missing'): 'x'}, sleep=0)
+
+
+def test_fill_form_none():
+    name = Selector(By.NAME, 'name')
+    browser = fake_browser([FakePage(URL, {name.locator: [FakeNode(attributes={'value': 'old'})]})])
+    browser.go(URL, sleep=0)
+    pe = browser.find_element(name)
+    browser.fill_form({pe: None}, verify=True, sleep=0)
+    assert pe.get_attribute('value') == ''
+    browser.fill_form({name: None}, verify=True, sleep=0)
+
+
+def test_actions(browser):
+    with browser.actions(sleep=0) as a:
+        a.move_to(ROWS, element_index=3).click().pause(0.1)
+        a.drag_and_drop(ROWS, ROWS, source_index=1, target_index=2)
+        a.send_keys('abc').press(Keys.ENTER)
+    executor = browser.driver.command_executor
+    assert executor.commands['actions'] == 1
+    # keys and buttons still held are released after every perform
+    assert executor.commands['clearActionState'] == 1
+    browser.press_Enter()
+    assert executor.commands['actions'] == 2
+    assert len(executor.actions) == 2
+
+
+def test_actions_released_on_error(browser):
+    with pytest.raises(ValueError):
+        with browser.actions(sleep=0) as a:
+            a.key_down(Keys.SHIFT).click(ROWS)
+            raise ValueError
+    executor = browser.driver.command_executor
+    assert executor.commands['actions'] == 0
+    assert executor.commands['clearActionState'] == 1
+
+
+def test_selector_hashable():
+    assert Selector(By.CSS_SELECTOR, '.row', desc='rows') == ROWS
+    assert len({ROWS, Selector(By.CSS_SELECTOR, '.row'), Selector(By.ID, 'row')}) == 2
+    with pytest.raises(AttributeError):
+        ROWS.extra = 1
+
+
+def test_handle_cache(browser):
+    browser.fill_text(ROWS, 'a', element_index=2, quick=True, sleep=0)
+    assert round_trips(browser) == 5
+    browser.fill_text(ROWS, 'a', element_index=2, quick=True, sleep=0)
+    assert round_trips(browser) == 9
+    browser.go(URL, sleep=0)
+    browser.driver.command_executor.commands.clear()
+    browser.fill_text(ROWS, 'a', element_index=2, quick=True, sleep=0)
+    assert round_trips(browser) == 5
+
+
+def test_click_drops_handles(browser):
+    # a click may navigate, so the next lookup is not served from the cache
+    browser.click(ROWS, element_index=2, sleep=0)
+    assert round_trips(browser) == 4
+    browser.click(ROWS, element_index=2, sleep=0)
+    assert round_trips(browser) == 8
@@ -0,0 +1,110 @@
+import time
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import ChromeOptions
+
+from pakselenium import Browser, Settings
+from pakselenium.test.fake_driver import FakeExecutor
+from pakselenium.utils import scripts, service
+from pakselenium.utils.service import Spares, chrome_capabilities
+
+
+class Driver(object):
+    def __init__(self):
+        self.quit_called = False
+        self.alive = True
+
+    @property
+    def window_handles(self):
+        if not self.alive:
+            raise WebDriverException('chrome not reachable')
+        return ['main']
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Service(object):
+    started = []
+
+    def __init__(self, path, port=0, service_args=None, log_path=None):
+        self.args = (path, port, service_args, log_path)
+        self.service_url = 'http://127.0.0.1:9515'
+
+    def start(self):
+        self.started.append(self)
+
+    def stop(self):
+        pass
+
+
+def test_spares():
+    created = []
+
+    def create():
+        created.append(Driver())
+        return created[-1]
+
+    spares = Spares(create, 2)
+    while spares.ready < 2:
+        time.sleep(0.001)
+    driver = spares.take()
+    assert driver is created[0]
+    while spares.ready < 2:
+        time.sleep(0.001)
+    assert len(created) == 3
+    spares.close()
+    assert [i.quit_called for i in created] == [False, True, True]
+
+
+def test_dead_spare_skipped():
+    created = []
+
+    def create():
+        created.append(Driver())
+        return created[-1]
+
+    spares = Spares(create, 1)
+    while spares.ready < 1:
+        time.sleep(0.001)
+    created[0].alive = False
+    driver = spares.take()
+    assert driver.alive
+    assert created[0].quit_called
+    spares.close()
+
+
+def test_chrome_capabilities():
+    options = ChromeOptions()
+    options.add_argument('--headless')
+    capabilities = chrome_capabilities(options, {'pageLoadStrategy': 'none'})
+    assert capabilities['pageLoadStrategy'] == 'none'
+    assert capabilities['goog:chromeOptions']['args'] == ['--headless']
+    assert chrome_capabilities()['browserName'] == 'chrome'
+
+
+def test_init_chrome_shared(monkeypatch):
+    monkeypatch.setattr(service, 'Service', Service)
+    monkeypatch.setattr(service, 'ChromeRemoteConnection', lambda remote_server_addr, keep_alive: FakeExecutor())
+    monkeypatch.setattr(service, '_services', {})
+    monkeypatch.setattr(Service, 'started', [])
+    browsers = [Browser(Settings(shared_service=True)) for _ in range(2)]
+    for browser in browsers:
+        # the keyword arguments of webdriver.Chrome
+        browser.init_chrome('chromedriver', port=9515, service_args=['--verbose'], service_log_path='cd.log',
+                            chrome_options=ChromeOptions(), keep_alive=False)
+    assert [i.args for i in Service.started] == [('chromedriver', 9515, ['--verbose'], 'cd.log')]
+    assert browsers[0].driver is not browsers[1].driver
+
+
+def test_wait_ready(monkeypatch):
+    states = ['loading', 'interactive', 'complete']
+    executor = FakeExecutor()
+    executor.scripts[scripts.READY_STATE] = lambda: states.pop(0) if len(states) > 1 else states[0]
+    monkeypatch.setattr(service, 'chrome_session', lambda *args, **kwargs: webdriver.Remote(executor, {}))
+    browser = Browser(Settings(shared_service=True))
+    browser.init_chrome('chromedriver')
+    assert states == ['complete']
+    executor.scripts[scripts.READY_STATE] = lambda: 'loading'
+    assert not browser._wait_ready(0.1)
@@ -0,0 +1,43 @@
+from pakselenium.test.fake_driver import fake_browser
+from pakselenium.utils import session
+
+URL = 'https://example.com/account'
+COOKIE = {'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/', 'expiry': 2000000000}
+
+
+def test_cookie_conversion():
+    cdp = session.to_cdp_cookies([COOKIE])
+    assert cdp[0]['expires'] == COOKIE['expiry']
+    assert session.from_cdp_cookies([dict(cdp[0], session=False, size=4)]) == [COOKIE]
+    assert 'expiry' not in session.from_cdp_cookies([dict(cdp[0], expires=-1, session=True)])[0]
+
+
+def test_save_restore(tmp_path):
+    path = str(tmp_path / 'session.json.gz')
+    browser = fake_browser()
+    browser.go(URL, sleep=0)
+    executor = browser.driver.command_executor
+    executor.cookies.append(dict(COOKIE))
+    executor.local_storage['token'] = 'abc'
+    browser.save_session(path)
+
+    restored = fake_browser()
+    state = restored.restore_session(path, sleep=0)
+    assert state['url'] == URL
+    assert restored.current_url == URL
+    assert restored.driver.command_executor.local_storage == {'token': 'abc'}
+    assert restored.driver.command_executor.cookies[0]['name'] == 'sid'
+
+
+def test_restore_with_cdp(tmp_path):
+    path = str(tmp_path / 'session.json.gz')
+    session.save_state(path, {'url': URL, 'origin': 'https://example.com', 'local': {'token': 'abc'},
+                              'session': {}, 'cookies': [COOKIE]})
+    browser = fake_browser()
+    browser.settings.driver_name = 'chrome'
+    browser.restore_session(path, sleep=0)
+    cdp = [cmd for cmd, params in browser.driver.command_executor.cdp]
+    # the second script is the request tracker of settle mode, registered once for the session
+    assert cdp == ['Network.setCookies', 'Page.addScriptToEvaluateOnNewDocument',
+                   'Page.addScriptToEvaluateOnNewDocument', 'Page.removeScriptToEvaluateOnNewDocument']
+    assert browser.current_url == URL
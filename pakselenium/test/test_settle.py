@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from selenium.common.exceptions import JavascriptException
+
+from pakselenium import Browser, Settings
+from pakselenium.test.fake_driver import FakePage, fake_browser
+from pakselenium.utils import scripts
+
+
+class Driver(object):
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.scripts = 0
+        self.timeouts = []
+
+    def set_script_timeout(self, timeout):
+        self.timeouts.append(timeout)
+
+    def execute_async_script(self, script, *args):
+        self.scripts += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, 'sleep', slept.append)
+    return slept
+
+
+def new_browser(settings: Settings, driver: Driver) -> Browser:
+    browser = Browser(settings)
+    browser.driver = driver
+    return browser
+
+
+def test_settle_off(sleeps):
+    driver = Driver()
+    new_browser(Settings(), driver)._settle(0.5)
+    assert sleeps == [0.5]
+    assert driver.scripts == 0
+
+
+def test_settle_on(sleeps):
+    driver = Driver([True])
+    new_browser(Settings(settle=True), driver)._settle(0.5)
+    assert sleeps == []
+    assert driver.scripts == 1
+    # raised for the script only
+    assert driver.timeouts[-1] == 30
+
+
+def test_settle_restarts_on_new_document(sleeps):
+    driver = Driver([JavascriptException(), True])
+    assert new_browser(Settings(settle=True), driver).settle(5)
+    assert driver.scripts == 2
+
+
+def test_request_tracker_on_new_documents():
+    pages = [FakePage(f'https://example.com/{i}') for i in range(2)]
+    browser = fake_browser(pages, settings=Settings(settle=True))
+    browser.settings.driver_name = 'chrome'
+    for page in pages:
+        browser.go(page.url, sleep=0)
+    executor = browser.driver.command_executor
+    # registered once per session, before the first page loads
+    assert executor.cdp == [('Page.addScriptToEvaluateOnNewDocument', {'source': scripts.REQUEST_TRACKER})]
@@ -0,0 +1,51 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from pakselenium import Selector, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+pytest.importorskip('lxml')
+pytest.importorskip('cssselect')
+
+URL = 'https://example.com'
+SOURCE = '''<html><head><script>var x = 1;</script></head><body>
+<table id="table">
+  <tr class="row"><td>  first
+   row </td><td><a href="/1">link 1</a></td></tr>
+  <tr class="row"><td>second row</td><td><a href="/2">link 2</a></td></tr>
+</table>
+</body></html>'''
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+LINK = Selector(By.TAG_NAME, 'a')
+
+
+@pytest.fixture
+def browser():
+    live = FakeNode('second row link 2')
+    page = FakePage(URL, {(By.XPATH, '/html/body/table/tr[2]'): [live]}, source=SOURCE)
+    browser = fake_browser([page])
+    browser.go(URL, sleep=0)
+    browser.driver.command_executor.commands.clear()
+    return browser
+
+
+def test_queries(browser):
+    snapshot = browser.snapshot()
+    rows = snapshot.find_elements(ROWS)
+    assert [i.text for i in rows] == ['first row link 1', 'second row link 2']
+    assert snapshot.find_elements(Selector(By.XPATH, '//tr'))[1].text == rows[1].text
+    assert snapshot.is_on_page(Selector(By.ID, 'table'))
+    assert not snapshot.is_on_page(Selector(By.CLASS_NAME, 'missing'))
+    assert snapshot.find_element_from(rows[1], LINK).get_attribute('href') == '/2'
+    assert snapshot.find_element(Selector(By.LINK_TEXT, 'link 1')).get_attribute('href') == '/1'
+    assert len(snapshot.find_elements_contains(ROWS, 'row')) == 2
+    assert snapshot.condition_text_equal(Selector(By.CSS_SELECTOR, 'td'), 'first row')
+    with pytest.raises(NoSuchElementException):
+        snapshot.find_elements_with_text(ROWS, 'third row')
+    assert browser.driver.command_executor.round_trips == 1
+
+
+def test_to_page_element(browser):
+    row = browser.snapshot().find_elements(ROWS)[1]
+    assert row.xpath == '/html/body/table/tr[2]'
+    assert row.to_page_element().text == 'second row link 2'
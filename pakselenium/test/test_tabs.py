@@ -0,0 +1,55 @@
+from pakselenium import Selector, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+URLS = [f'https://example.com/{i}' for i in range(3)]
+
+
+def test_tabs():
+    browser = fake_browser([FakePage(url, {ROWS.locator: [FakeNode(f'row {i}')]}) for i, url in enumerate(URLS)])
+    executor = browser.driver.command_executor
+    tabs = [browser.new_tab(url) for url in URLS]
+    assert len(browser.tabs) == 3
+    assert executor.commands['switchToWindow'] == 3
+
+    for i, tab in enumerate(tabs):
+        tab.wait_until_on_page(ROWS)
+        assert tab.find_element(ROWS).text == f'row {i}'
+    assert executor.commands['switchToWindow'] == 6
+
+    # the active tab is not switched to again
+    assert tabs[2].is_active
+    assert tabs[2].current_url == URLS[2]
+    assert executor.commands['switchToWindow'] == 6
+
+    tabs[1].close()
+    assert browser.tabs == [tabs[0], tabs[2]]
+    assert tabs[0].current_url == URLS[0]
+
+
+def test_text_index_per_tab():
+    browser = fake_browser([FakePage(url, {ROWS.locator: [FakeNode(f'row {i}')]}) for i, url in enumerate(URLS)])
+    first, second = browser.new_tab(URLS[0]), browser.new_tab(URLS[1])
+    index = first.text_index(ROWS)
+    assert second.text_index(ROWS) is not index
+    assert first.text_index(ROWS) is index
+
+
+def test_main_window_caches():
+    browser = fake_browser([FakePage(url, {ROWS.locator: [FakeNode(f'row {i}')]}) for i, url in enumerate(URLS)])
+    browser.go(URLS[0], sleep=0)
+    index = browser.text_index(ROWS)
+    tab = browser.new_tab(URLS[1])
+    assert tab.text_index(ROWS) is not index
+    browser.switch_to('main')
+    assert browser.text_index(ROWS) is index
+
+
+def test_close_switches_back():
+    browser = fake_browser([FakePage(url, {ROWS.locator: [FakeNode(f'row {i}')]}) for i, url in enumerate(URLS)])
+    browser.go(URLS[0], sleep=0)
+    tab = browser.new_tab(URLS[1])
+    tab.close()
+    assert browser.current_url == URLS[0]
+    browser.go(URLS[2], sleep=0)
+    assert browser.find_element(ROWS).text == 'row 2'
@@ -0,0 +1,44 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from pakselenium import Selector, Settings, By
+from pakselenium.test.fake_driver import FakeNode, FakePage, fake_browser
+
+URL = 'https://example.com'
+ROWS = Selector(By.CSS_SELECTOR, '.row')
+SPINNER = Selector(By.CSS_SELECTOR, '.spinner')
+
+
+@pytest.fixture
+def browser():
+    browser = fake_browser([FakePage(URL, {ROWS.locator: [FakeNode('row')]})],
+                           settings=Settings(settle=True, observe_dom=True))
+    browser.go(URL, sleep=0)
+    return browser
+
+
+def test_wait_for_dom(browser):
+    assert browser.wait_for_dom(until=ROWS, until_lost=SPINNER, timeout=1)
+    assert not browser.wait_for_dom(until=[ROWS, SPINNER], timeout=1)
+    assert not browser.wait_for_dom(until_lost=ROWS, timeout=1)
+
+
+def test_observed_waits(browser):
+    browser.wait_until_on_page(ROWS, timeout=1)
+    browser.wait_until_not_on_page(SPINNER, timeout=1)
+    with pytest.raises(TimeoutException):
+        browser.wait_until_on_page(SPINNER, timeout=1)
+
+
+def test_script_timeout_restored(browser):
+    executor = browser.driver.command_executor
+    executor.timeouts.clear()
+    browser.wait_for_dom(until=ROWS, timeout=10)
+    assert [i['script'] for i in executor.timeouts] == [15000, 30000]
+
+
+def test_document_unloaded(browser):
+    # the first script dies with the old document, the wait goes on on the new one
+    browser.driver.command_executor.fail('w3cExecuteScriptAsync', 'javascript error')
+    browser.wait_until_on_page(ROWS, timeout=10)
+    assert browser.driver.command_executor.commands['w3cExecuteScriptAsync'] == 2
@@ -1,32 +1,46 @@
+import itertools
 import sys
-import time
 import traceback
-from typing import Callable
+from functools import wraps
+from typing import Callable, Union
 
 from selenium.common.exceptions import StaleElementReferenceException
 from selenium.common.exceptions import TimeoutException
 
 from pakselenium import config
+from pakselenium.utils import instrument
+from pakselenium.utils import poll
+from pakselenium.utils.logs import logf
+from pakselenium.utils.poll import PollPolicy
+
+
+def _get_intervals(sleep: Union[float, PollPolicy, None], args: tuple):
+    # sleep=None takes the poll policy from the settings of the decorated method's instance
+    if sleep is None:
+        settings = getattr(args[0], 'settings', None) if args else None
+        sleep = getattr(settings, 'poll_policy', 1)
+    return poll.intervals(sleep)
 
 
 def staleElementReferenceException(to_call: Callable = None,
                                    desc: str = None, print_traceback: bool = False,
-                                   return_on_exception: bool = False, sleep: int = 1):
+                                   return_on_exception: bool = False,
+                                   sleep: Union[float, PollPolicy, None] = 1, retries: int = None):
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            if config.debug_verbose >= 2 and desc is not None:
-                print(f'[{desc}]: [{args}, {kwargs}]')
+            logf('[%s]: [%s, %s]' if desc is not None else None, desc, args, kwargs)
 
             if config.debug_all or config.debug_staleElementReferenceException:
                 return func(*args, **kwargs)
 
-            while 1:
+            delays = _get_intervals(sleep, args)
+            for attempt in itertools.count():
                 try:
                     return func(*args, **kwargs)
                 except StaleElementReferenceException as e:
                     # when element is updating
-                    if config.debug_verbose >= 1:
-                        print(f'[{desc}]: caught StaleElementReferenceException')
+                    logf('[%s]: caught StaleElementReferenceException', desc, min_verbose=1)
 
                     if print_traceback:
                         exc_info = sys.exc_info()
@@ -38,13 +52,18 @@ def staleElementReferenceException(to_call: Callable = None,
 
                     if return_on_exception:
                         return e
+
+                    # retries=None keeps trying until the call succeeds
+                    if retries is not None and attempt >= retries:
+                        raise
                 except Exception as e:
                     if print_traceback:
                         exc_info = sys.exc_info()
                         traceback.print_exception(*exc_info)
                     raise e
 
-                time.sleep(sleep)
+                instrument.record_retry()
+                instrument.sleep(next(delays))
 
         return wrapper
 
@@ -53,22 +72,23 @@ def staleElementReferenceException(to_call: Callable = None,
 
 def timeoutException(to_call: Callable = None,
                      desc: str = None, print_traceback: bool = False,
-                     return_on_exception: bool = False, sleep: int = 1):
+                     return_on_exception: bool = False,
+                     sleep: Union[float, PollPolicy, None] = 1, retries: int = None):
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            if config.debug_verbose >= 2 and desc is not None:
-                print(f'[{desc}]: [{args}, {kwargs}]')
+            logf('[%s]: [%s, %s]' if desc is not None else None, desc, args, kwargs)
 
             if config.debug_all or config.debug_timeoutException:
                 return func(*args, **kwargs)
 
-            while 1:
+            delays = _get_intervals(sleep, args)
+            for attempt in itertools.count():
                 try:
                     return func(*args, **kwargs)
                 except TimeoutException as e:
                     # when slow loading elements
-                    if config.debug_verbose >= 1:
-                        print(f'[{desc}]: caught TimeoutException')
+                    logf('[%s]: caught TimeoutException', desc, min_verbose=1)
 
                     if print_traceback:
                         exc_info = sys.exc_info()
@@ -80,13 +100,18 @@ def timeoutException(to_call: Callable = None,
 
                     if return_on_exception:
                         return e
+
+                    # retries=None keeps trying until the call succeeds
+                    if retries is not None and attempt >= retries:
+                        raise
                 except Exception as e:
                     if print_traceback:
                         exc_info = sys.exc_info()
                         traceback.print_exception(*exc_info)
                     raise e
 
-                time.sleep(sleep)
+                instrument.record_retry()
+                instrument.sleep(next(delays))
 
         return wrapper
 
@@ -95,21 +120,22 @@ def timeoutException(to_call: Callable = None,
 
 def call_if_exception(to_call: Callable, exception=Exception,
                       desc: str = None, print_traceback: bool = False,
-                      return_on_exception: bool = False, sleep: int = 1):
+                      return_on_exception: bool = False,
+                      sleep: Union[float, PollPolicy, None] = 1, retries: int = None):
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            if config.debug_verbose >= 2 and desc is not None:
-                print(f'[{desc}]: [{args}, {kwargs}]')
+            logf('[%s]: [%s, %s]' if desc is not None else None, desc, args, kwargs)
 
             if config.debug_all:
                 return func(*args, **kwargs)
 
-            while 1:
+            delays = _get_intervals(sleep, args)
+            for attempt in itertools.count():
                 try:
                     return func(*args, **kwargs)
                 except exception as e:
-                    if config.debug_verbose >= 1:
-                        print(f'[{desc}]: caught {repr(e)}')
+                    logf('[%s]: caught %r', desc, e, min_verbose=1)
 
                     if print_traceback:
                         exc_info = sys.exc_info()
@@ -121,7 +147,11 @@ def call_if_exception(to_call: Callable, exception=Exception,
                     if return_on_exception:
                         return e
 
-                    time.sleep(sleep)
+                    if retries is not None and attempt >= retries:
+                        raise
+
+                    instrument.record_retry()
+                    instrument.sleep(next(delays))
 
         return wrapper
 
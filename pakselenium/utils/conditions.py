@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import List, Callable, Any, TYPE_CHECKING
+
+from pakselenium.utils import scripts
+
+if TYPE_CHECKING:
+    from pakselenium.browser import Selector
+
+
+@dataclass(frozen=True)
+class TextCondition(object):
+    # declarative Browser.condition_text_*: the text of the first element found by selector;
+    # not_in and not_equal need the element on the page
+    selector: 'Selector'
+    text: str
+    match: str = 'is_in'
+
+    @classmethod
+    def is_in(cls, selector: 'Selector', text: str) -> 'TextCondition':
+        return cls(selector, text, 'is_in')
+
+    @classmethod
+    def not_in(cls, selector: 'Selector', text: str) -> 'TextCondition':
+        return cls(selector, text, 'not_in')
+
+    @classmethod
+    def equal(cls, selector: 'Selector', text: str) -> 'TextCondition':
+        return cls(selector, text, 'equal')
+
+    @classmethod
+    def not_equal(cls, selector: 'Selector', text: str) -> 'TextCondition':
+        return cls(selector, text, 'not_equal')
+
+
+@dataclass
+class Matched(object):
+    # until and until_lost hold one bool per declarative condition, in the order they were given
+    until: List[bool] = field(default_factory=list)
+    until_lost: List[bool] = field(default_factory=list)
+    empty: bool = False
+    reload: bool = False
+    reached: bool = False
+
+
+def _as_list(conditions) -> list:
+    if conditions is None:
+        return []
+    if isinstance(conditions, (list, tuple)):
+        return list(conditions)
+    return [conditions]
+
+
+class Conditions(object):
+    # until, until_lost, empty and reload of is_reached_page; Selectors and TextConditions of all four
+    # are checked by one script per poll, python callables are still called one by one
+
+    def __init__(self, until: Any = None, until_lost: Any = None, empty: Any = None, reload: Any = None):
+        self.checks = []
+        self.until, self.until_callables = self._add(until, 'present')
+        self.until_lost, self.until_lost_callables = self._add(until_lost, 'absent')
+        self.empty, self.empty_callables = self._add(empty, 'present')
+        self.reload, self.reload_callables = self._add(reload, 'present')
+
+    def _add(self, conditions, kind: str):
+        indexes, callables = [], []
+        for condition in _as_list(conditions):
+            if isinstance(condition, TextCondition):
+                indexes.append(len(self.checks))
+                self.checks.append([condition.match, condition.selector.by, condition.selector.value,
+                                    condition.text])
+            elif callable(condition):
+                callables.append(condition)
+            else:
+                indexes.append(len(self.checks))
+                self.checks.append([kind, condition.by, condition.value, None])
+        return indexes, callables
+
+    def check(self, driver) -> Matched:
+        # callables are evaluated in the old order and only when still needed
+        found = driver.execute_script(scripts.CHECK_CONDITIONS, self.checks) if self.checks else []
+        matched = Matched(until=[found[i] for i in self.until], until_lost=[found[i] for i in self.until_lost])
+        matched.empty = any(found[i] for i in self.empty) or _any(self.empty_callables)
+        if matched.empty:
+            return matched
+        matched.reload = any(found[i] for i in self.reload) or _any(self.reload_callables)
+        if matched.reload:
+            return matched
+        matched.reached = (all(matched.until) and all(matched.until_lost)
+                           and _all(self.until_callables) and _all(self.until_lost_callables))
+        return matched
+
+
+def _any(callables: List[Callable]) -> bool:
+    return any(i() for i in callables)
+
+
+def _all(callables: List[Callable]) -> bool:
+    return all(i() for i in callables)
@@ -0,0 +1,38 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List
+
+
+class Seen(object):
+    # remembers the keys of the last `size` records only, so memory stays bounded on any listing length
+
+    def __init__(self, size: int = 100000, key: Callable[[Any], Hashable] = None):
+        assert size > 0
+        self.size = size
+        self.key = key
+        self._keys = OrderedDict()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _key(self, record) -> Hashable:
+        if self.key is not None:
+            return self.key(record)
+        try:
+            hash(record)
+            return record
+        except TypeError:
+            return repr(record)
+
+    def add(self, record) -> bool:
+        # True when the record was not seen yet
+        key = self._key(record)
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.size:
+            self._keys.popitem(last=False)
+        return True
+
+    def new(self, records: Iterable) -> List:
+        return [i for i in records if self.add(i)]
@@ -2,8 +2,8 @@ from typing import List, Union
 
 from selenium.common.exceptions import NoSuchElementException, ElementClickInterceptedException
 
-from pakselenium import config
 from pakselenium.browser import Browser, Selector
+from pakselenium.utils.logs import logf
 
 
 def close_popup(selector: Union[Selector, List[Selector]], desc: str = None,
@@ -15,15 +15,13 @@ def close_popup(selector: Union[Selector, List[Selector]], desc: str = None,
         def wrapper(self, *args, **kwargs):
             browser: Browser = self.browser
 
-            if config.debug_verbose >= 2 and desc is not None:
-                print(f'[{desc}]: [{self}, {args}, {kwargs}]')
+            logf('[%s]: [%s, %s, %s]' if desc is not None else None, desc, self, args, kwargs)
 
             def do():
                 for i in selector:
                     if browser.is_on_page(i):
                         browser.click(i, sleep=2.0)
-                        if config.debug_verbose >= 1:
-                            print(f'[{desc}]: closed popup: {i.desc}')
+                        logf('[%s]: closed popup: %s', desc, i.desc, min_verbose=1)
 
             if before:
                 do()
@@ -35,8 +33,7 @@ def close_popup(selector: Union[Selector, List[Selector]], desc: str = None,
                     answer = func(self, *args, **kwargs)
                     break
                 except (NoSuchElementException, ElementClickInterceptedException):
-                    if config.debug_verbose >= 1:
-                        print(f'[{desc}]: caught Exception')
+                    logf('[%s]: caught Exception', desc, min_verbose=1)
                     if n >= 3:
                         raise
                     if on_error:
@@ -0,0 +1,201 @@
+import bisect
+import inspect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Callable, Generator, List, Dict, Tuple
+
+
+@dataclass
+class Call(object):
+    method: str
+    wall: float = 0.0
+    sleep: float = 0.0
+    wait: float = 0.0
+    round_trips: int = 0
+    retries: int = 0
+
+
+_subscribers: List[Callable[[Call], None]] = []
+_local = threading.local()
+
+
+def subscribe(callback: Callable[[Call], None]):
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[Call], None]):
+    _subscribers.remove(callback)
+
+
+def _stack() -> List[Call]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(name: str, value):
+    # counters are inclusive: a nested call adds to every call on the stack
+    stack = getattr(_local, 'stack', None)
+    if not stack:
+        return
+    for call in stack:
+        setattr(call, name, getattr(call, name) + value)
+
+
+def record_round_trip():
+    _record('round_trips', 1)
+
+
+def record_retry():
+    _record('retries', 1)
+
+
+def sleep(seconds: float):
+    time.sleep(seconds)
+    _record('sleep', seconds)
+
+
+@contextmanager
+def waiting():
+    # only the outermost wait is timed, so waits nested in waits are not counted twice
+    depth = getattr(_local, 'waiting', 0)
+    _local.waiting = depth + 1
+    tt = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.waiting = depth
+        if depth == 0:
+            _record('wait', time.perf_counter() - tt)
+
+
+def waits(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with waiting():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _publish(call: Call):
+    for callback in list(_subscribers):
+        callback(call)
+
+
+def _timed_steps(call: Call, generator: Generator):
+    # only the steps are timed, not the caller's work between them; reported once the generator is done
+    stack = _stack()
+    step = partial(generator.send, None)
+    try:
+        while 1:
+            stack.append(call)
+            tt = time.perf_counter()
+            try:
+                item = step()
+            except StopIteration as e:
+                return e.value
+            finally:
+                call.wall += time.perf_counter() - tt
+                stack.pop()
+            try:
+                step = partial(generator.send, (yield item))
+            except Exception as e:
+                step = partial(generator.throw, e)
+    finally:
+        generator.close()
+        _publish(call)
+
+
+def instrumented(func: Callable) -> Callable:
+    method = func.__qualname__
+    steps = inspect.isgeneratorfunction(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _subscribers:
+            return func(*args, **kwargs)
+
+        call = Call(method)
+        if steps:
+            return _timed_steps(call, func(*args, **kwargs))
+        stack = _stack()
+        stack.append(call)
+        tt = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            call.wall = time.perf_counter() - tt
+            stack.pop()
+            _publish(call)
+
+    return wrapper
+
+
+def instrument_methods(cls):
+    for name, value in list(vars(cls).items()):
+        if not name.startswith('_') and callable(value) and not isinstance(value, (staticmethod, classmethod)):
+            setattr(cls, name, instrumented(value))
+    return cls
+
+
+def count_round_trips(driver):
+    # every WebDriver command, including WebElement ones, goes through driver.execute
+    execute = driver.execute
+    if getattr(execute, 'counted', False):
+        return
+
+    def counted(driver_command, params=None):
+        record_round_trip()
+        return execute(driver_command, params)
+
+    counted.counted = True
+    driver.execute = counted
+
+
+class Profiler(object):
+    buckets: Tuple[float, ...] = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.calls: Dict[str, List[Call]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        subscribe(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        unsubscribe(self)
+
+    def __call__(self, call: Call):
+        with self._lock:
+            self.calls[call.method].append(call)
+
+    def histogram(self, method: str) -> List[int]:
+        counts = [0] * (len(self.buckets) + 1)
+        for call in self.calls[method]:
+            counts[bisect.bisect_right(self.buckets, call.wall)] += 1
+        return counts
+
+    def report(self) -> str:
+        lines = []
+        for method, calls in sorted(self.calls.items(), key=lambda i: -sum(c.wall for c in i[1])):
+            walls = sorted(c.wall for c in calls)
+            lines.append(f'{method}: calls={len(calls)} total={sum(walls):.3f}s '
+                         f'p50={walls[len(walls) // 2]:.3f}s p95={walls[int(len(walls) * 0.95)]:.3f}s '
+                         f'max={walls[-1]:.3f}s sleep={sum(c.sleep for c in calls):.3f}s '
+                         f'wait={sum(c.wait for c in calls):.3f}s '
+                         f'round_trips={sum(c.round_trips for c in calls)} retries={sum(c.retries for c in calls)}')
+            counts = self.histogram(method)
+            width = max(counts)
+            for i, count in enumerate(counts):
+                if not count:
+                    continue
+                label = f'<{self.buckets[i]}s' if i < len(self.buckets) else f'>={self.buckets[-1]}s'
+                lines.append(f'  {label:>8} {"#" * max(1, 40 * count // width):<40} {count}')
+        return '\n'.join(lines)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+def _extensions(*extensions: str) -> List[str]:
+    # the url ends with the extension or a query string follows it, as in cdn urls like x.png?v=1
+    return [i for e in extensions for i in (f'*.{e}', f'*.{e}?*')]
+
+
+IMAGES = _extensions('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp')
+FONTS = _extensions('woff', 'woff2', 'ttf', 'otf', 'eot')
+MEDIA = _extensions('mp4', 'webm', 'ogg', 'ogv', 'mp3', 'wav', 'm4a', 'mov', 'avi', 'm3u8')
+STYLESHEETS = _extensions('css')
+ANALYTICS = [
+    '*google-analytics.com*', '*googletagmanager.com*', '*googlesyndication.com*', '*doubleclick.net*',
+    '*adservice.google.*', '*facebook.net*', '*connect.facebook.com*', '*mc.yandex.ru*', '*an.yandex.ru*',
+    '*hotjar.com*', '*scorecardresearch.com*', '*amazon-adsystem.com*', '*criteo.*', '*taboola.com*',
+    '*outbrain.com*', '*adnxs.com*', '*mixpanel.com*', '*segment.io*', '*newrelic.com*', '*nr-data.net*',
+]
+
+
+@dataclass(frozen=True)
+class LoadProfile(object):
+    images: bool = False
+    fonts: bool = False
+    media: bool = False
+    stylesheets: bool = False
+    analytics: bool = False
+    patterns: List[str] = field(default_factory=list)
+
+    @property
+    def blocked_urls(self) -> List[str]:
+        # url patterns for Network.setBlockedURLs, '*' is a wildcard
+        urls = []
+        for enabled, patterns in ((self.images, IMAGES), (self.fonts, FONTS), (self.media, MEDIA),
+                                  (self.stylesheets, STYLESHEETS), (self.analytics, ANALYTICS)):
+            if enabled:
+                urls.extend(patterns)
+        urls.extend(self.patterns)
+        return urls
+
+
+FULL = LoadProfile()
+LEAN = LoadProfile(images=True, fonts=True, media=True, analytics=True)
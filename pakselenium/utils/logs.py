@@ -0,0 +1,39 @@
+import logging
+import sys
+from typing import Optional
+
+from pakselenium import config
+
+logger = logging.getLogger('pakselenium')
+# a library leaves handlers and levels to the application, see log_to_stdout()
+logger.addHandler(logging.NullHandler())
+
+
+class _Formatter(logging.Formatter):
+    # log(..., end=' ... ') continues the line like print(..., end=' ... ') did
+    def format(self, record: logging.LogRecord) -> str:
+        return super().format(record) + getattr(record, 'end', '\n')
+
+
+def log_to_stdout(level: int = logging.DEBUG):
+    # the old print() output: messages on stdout, end=' ... ' continues the line
+    handler = logging.StreamHandler(sys.stdout)
+    handler.terminator = ''
+    handler.setFormatter(_Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def logf(msg: Optional[str], *args, min_verbose: int = 2, end: str = None):
+    # msg is a %-format string and args are only formatted if the record is emitted
+    if not msg or config.debug_verbose < min_verbose:
+        return
+    level = logging.INFO if min_verbose <= 1 else logging.DEBUG
+    if logger.isEnabledFor(level):
+        logger.log(level, msg, *args, extra={'end': '\n' if end is None else end})
+
+
+def log(msg: Optional[str], min_verbose: int = 2, end: str = None):
+    # the public signature of the print() days, msg is logged as is
+    logf(msg, min_verbose=min_verbose, end=end)
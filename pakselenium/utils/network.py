@@ -0,0 +1,60 @@
+import fnmatch
+import json
+import time
+from typing import Dict, List, Sequence
+
+# resource types of the DevTools Network domain that carry the page and its data
+DATA_TYPES = ('Document', 'XHR', 'Fetch')
+
+
+class NetworkTracker(object):
+    # in-flight requests of a chrome session, read from its performance log
+    # (goog:loggingPrefs {'performance': 'ALL'}, see Settings.track_network)
+
+    def __init__(self, driver, types: Sequence[str] = DATA_TYPES, ignore: List[str] = None):
+        # types=None tracks every resource type; ignore holds url patterns, '*' is a wildcard
+        self.driver = driver
+        self.types = None if types is None else set(types)
+        self.ignore = list(ignore or [])
+        self.in_flight: Dict[str, str] = {}
+        self.finished = 0
+        self.failed = 0
+        self.changed = time.time()
+
+    def __repr__(self):
+        return f'NetworkTracker(in_flight={len(self.in_flight)}, finished={self.finished}, failed={self.failed})'
+
+    def _is_tracked(self, params: dict) -> bool:
+        if self.types is not None and params.get('type') not in self.types:
+            return False
+        url = params.get('request', {}).get('url', '')
+        return not any(fnmatch.fnmatchcase(url, i) for i in self.ignore)
+
+    def poll(self) -> int:
+        # reads the log entries since the last poll, returns the number of requests in flight
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                if self._is_tracked(params):
+                    # a redirect is sent again with the same requestId
+                    self.in_flight[params['requestId']] = params['request']['url']
+                    self.changed = time.time()
+            elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+                if self.in_flight.pop(params.get('requestId'), None) is not None:
+                    if method == 'Network.loadingFinished':
+                        self.finished += 1
+                    else:
+                        self.failed += 1
+                    self.changed = time.time()
+        return len(self.in_flight)
+
+    def reset(self):
+        # before a navigation: requests of the old document no longer count
+        self.poll()
+        self.in_flight = {}
+        self.changed = time.time()
+
+    def is_idle(self, idle: float) -> bool:
+        # nothing in flight and no tracked request started or ended for idle seconds
+        return self.poll() == 0 and time.time() - self.changed >= idle
@@ -0,0 +1,79 @@
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Iterator, Union, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from pakselenium.utils import instrument
+
+
+@dataclass
+class PollPolicy(object):
+    interval: float = 0.5
+    factor: float = 1.0
+    max_interval: Optional[float] = None
+    jitter: float = 0.0
+    burst: int = 0
+    burst_interval: float = 0.05
+
+    @classmethod
+    def backoff(cls, interval: float = 0.05, factor: float = 1.5, max_interval: float = 1.0,
+                jitter: float = 0.1, burst: int = 3) -> 'PollPolicy':
+        return cls(interval=interval, factor=factor, max_interval=max_interval, jitter=jitter,
+                   burst=burst, burst_interval=interval)
+
+    def intervals(self) -> Iterator[float]:
+        for _ in range(self.burst):
+            yield self.burst_interval
+
+        interval = self.interval
+        while 1:
+            if self.max_interval is not None:
+                interval = min(interval, self.max_interval)
+            # jitter is relative to the current interval, so parallel waiters do not poll in lockstep
+            yield max(interval + interval * random.uniform(-self.jitter, self.jitter), 0.0)
+            interval *= self.factor
+
+
+def intervals(sleep: Union[float, PollPolicy]) -> Iterator[float]:
+    if isinstance(sleep, PollPolicy):
+        return sleep.intervals()
+    return itertools.repeat(sleep)
+
+
+class PolicyWait(WebDriverWait):
+    # WebDriverWait with intervals taken from a PollPolicy instead of a fixed poll_frequency
+
+    def __init__(self, driver, timeout: float, policy: PollPolicy = None, ignored_exceptions=None):
+        super().__init__(driver, timeout, ignored_exceptions=ignored_exceptions)
+        self.policy = PollPolicy() if policy is None else policy
+
+    def _wait(self, method, expected: bool, message: str):
+        screen = None
+        stacktrace = None
+        delays = self.policy.intervals()
+        end_time = time.time() + self._timeout
+        while 1:
+            try:
+                value = method(self._driver)
+                if bool(value) is expected:
+                    return value
+            except self._ignored_exceptions as exc:
+                if not expected:
+                    return True
+                screen = getattr(exc, 'screen', None)
+                stacktrace = getattr(exc, 'stacktrace', None)
+            left = end_time - time.time()
+            if left <= 0:
+                break
+            instrument.sleep(min(next(delays), left))
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until(self, method, message: str = ''):
+        return self._wait(method, True, message)
+
+    def until_not(self, method, message: str = ''):
+        return self._wait(method, False, message)
@@ -0,0 +1,374 @@
+# JavaScript snippets executed in the page through driver.execute_script.
+# LOCATE mirrors selenium's By strategies, so a Selector can be resolved in-page.
+
+LOCATE = """
+function locate(by, value, root) {
+    root = root || document;
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'class name':
+            return Array.prototype.slice.call(root.querySelectorAll('.' + CSS.escape(value)));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'tag name':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'xpath':
+            var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) {
+                nodes.push(result.snapshotItem(i));
+            }
+            return nodes;
+        case 'link text':
+            return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (e) {
+                return text(e) === value;
+            });
+        case 'partial link text':
+            return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (e) {
+                return text(e).indexOf(value) !== -1;
+            });
+    }
+    throw new Error('unknown locator strategy: ' + by);
+}
+
+function text(e) {
+    // like WebElement.text: an element that is not rendered has no text, innerText would fall back
+    // to textContent; options are rendered when their select is
+    var box = e.tagName === 'OPTION' || e.tagName === 'OPTGROUP' ? e.closest('select') || e : e;
+    if (!box.getClientRects().length || getComputedStyle(e).visibility === 'hidden') {
+        return '';
+    }
+    return ((e.innerText === undefined ? e.textContent : e.innerText) || '').trim();
+}
+
+function attribute(e, name) {
+    var value = e[name];
+    if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+        return e.getAttribute(name);
+    }
+    if (typeof value === 'boolean') {
+        return value ? 'true' : null;
+    }
+    return String(value);
+}
+
+function attributes(e, names) {
+    var found = {};
+    names.forEach(function (name) {
+        found[name] = attribute(e, name);
+    });
+    return found;
+}
+"""
+
+# arguments: by, value, root element or null, attribute names
+# returns: [[element, text, {name: value}], ...]
+FIND_ELEMENTS = LOCATE + """
+var names = arguments[3] || [];
+return locate(arguments[0], arguments[1], arguments[2]).map(function (e) {
+    return [e, text(e), attributes(e, names)];
+});
+"""
+
+# arguments: elements, attribute names
+# returns: [[text, {name: value}], ...]
+PREFETCH = LOCATE + """
+var names = arguments[1] || [];
+return arguments[0].map(function (e) {
+    return [text(e), attributes(e, names)];
+});
+"""
+
+# async; arguments: [[by, value, should_be_present], ...], timeout in ms
+# resolves with true as soon as every condition holds, or with the last check on timeout
+WAIT_FOR_DOM = LOCATE + """
+var conditions = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+
+function matched() {
+    return conditions.every(function (c) {
+        return (locate(c[0], c[1]).length > 0) === c[2];
+    });
+}
+
+if (matched()) {
+    done(true);
+    return;
+}
+
+var finished = false, timer = null;
+var observer = new MutationObserver(function () {
+    if (!finished && matched()) {
+        finish(true);
+    }
+});
+
+function finish(result) {
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+}
+
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () {
+    finish(matched());
+}, timeout);
+"""
+
+# counts pending fetch/XHR requests of the document in window.__pakseleniumRequests; on chrome it is
+# evaluated on every new document before page scripts, elsewhere SETTLE installs it when it first runs
+REQUEST_TRACKER = """
+(function () {
+    if (window.__pakseleniumRequests) {
+        return;
+    }
+    var tracker = window.__pakseleniumRequests = {pending: 0};
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        tracker.pending++;
+        this.addEventListener('loadend', function () {
+            tracker.pending--;
+        });
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            tracker.pending++;
+            return fetch.apply(this, arguments).finally(function () {
+                tracker.pending--;
+            });
+        };
+    }
+})();
+"""
+
+# async; arguments: quiet period in ms, timeout in ms
+# resolves with true once the document is loaded, no fetch/XHR is pending and the DOM has not
+# changed for the quiet period, or with false on timeout
+SETTLE = REQUEST_TRACKER + """
+var quiet = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var tracker = window.__pakseleniumRequests;
+
+var start = Date.now(), changed = Date.now();
+var observer = new MutationObserver(function () {
+    changed = Date.now();
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+function check() {
+    var now = Date.now();
+    var ready = document.readyState === 'complete' && tracker.pending <= 0 && now - changed >= quiet;
+    if (ready || now - start >= timeout) {
+        observer.disconnect();
+        done(ready);
+        return;
+    }
+    setTimeout(check, Math.max(Math.min(quiet, 50), 10));
+}
+
+check();
+"""
+
+# arguments: by, value, root element or null, text, match ('equal', 'contains' or 'regex'), ignore case
+# returns: [[element, text], ...] of the elements whose text matches
+FIND_ELEMENTS_MATCHING = LOCATE + """
+var pattern = arguments[3], match = arguments[4], ignoreCase = arguments[5];
+var test;
+if (match === 'regex') {
+    var regex = new RegExp(pattern, ignoreCase ? 'i' : '');
+    test = function (s) {
+        return regex.test(s);
+    };
+} else {
+    if (ignoreCase) {
+        pattern = pattern.toLowerCase();
+    }
+    test = function (s) {
+        if (ignoreCase) {
+            s = s.toLowerCase();
+        }
+        return match === 'contains' ? s.indexOf(pattern) !== -1 : s === pattern;
+    };
+}
+var found = [];
+locate(arguments[0], arguments[1], arguments[2]).forEach(function (e, i) {
+    var s = text(e);
+    if (test(s)) {
+        found.push([e, s]);
+    }
+});
+return found;
+"""
+
+# returns: {url, origin, local: {key: value}, session: {key: value}}
+GET_STORAGE = """
+function dump(storage) {
+    var found = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        found[key] = storage.getItem(key);
+    }
+    return found;
+}
+
+var state = {url: location.href, origin: location.origin, local: {}, session: {}};
+try {
+    state.local = dump(localStorage);
+    state.session = dump(sessionStorage);
+} catch (e) {
+    // storage is not available on about:blank and data: urls
+}
+return state;
+"""
+
+# arguments: {key: value} for localStorage, {key: value} for sessionStorage
+SET_STORAGE = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function (k) {
+    localStorage.setItem(k, local[k]);
+});
+Object.keys(session).forEach(function (k) {
+    sessionStorage.setItem(k, session[k]);
+});
+"""
+
+# arguments: [[element or null, by, value, field value], ...], verify
+# returns: {missing: [field index], mismatched: [[field index, value in the page], ...]}
+FILL_FORM = LOCATE + """
+var fields = arguments[0], verify = arguments[1];
+
+function isCheckable(e) {
+    return e.tagName === 'INPUT' && (e.type === 'checkbox' || e.type === 'radio');
+}
+
+function setValue(e, value) {
+    if (isCheckable(e)) {
+        e.checked = !!value;
+    } else if (e.tagName === 'SELECT') {
+        var values = [].concat(value).map(String);
+        Array.prototype.forEach.call(e.options, function (o) {
+            o.selected = values.indexOf(o.value) !== -1;
+        });
+    } else if (e.isContentEditable) {
+        e.textContent = value;
+    } else {
+        // the prototype setter keeps frameworks that track the value property (React) in sync
+        var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(e), 'value');
+        if (descriptor && descriptor.set) {
+            descriptor.set.call(e, value);
+        } else {
+            e.value = value;
+        }
+    }
+}
+
+function getValue(e) {
+    if (isCheckable(e)) {
+        return e.checked;
+    } else if (e.tagName === 'SELECT' && e.multiple) {
+        return Array.prototype.filter.call(e.options, function (o) {
+            return o.selected;
+        }).map(function (o) {
+            return o.value;
+        });
+    } else if (e.isContentEditable) {
+        return e.textContent;
+    }
+    return e.value;
+}
+
+function isEqual(e, value) {
+    var found = getValue(e);
+    if (isCheckable(e)) {
+        return found === !!value;
+    } else if (Array.isArray(found)) {
+        return found.join('\\n') === [].concat(value).map(String).join('\\n');
+    }
+    return found === String(value);
+}
+
+var result = {missing: [], mismatched: []};
+var elements = fields.map(function (field, i) {
+    var e = field[0] || locate(field[1], field[2], null)[0];
+    if (!e) {
+        result.missing.push(i);
+    }
+    return e;
+});
+if (result.missing.length) {
+    return result;
+}
+elements.forEach(function (e, i) {
+    setValue(e, fields[i][3]);
+    e.dispatchEvent(new Event('input', {bubbles: true}));
+    e.dispatchEvent(new Event('change', {bubbles: true}));
+});
+if (verify) {
+    elements.forEach(function (e, i) {
+        if (!isEqual(e, fields[i][3])) {
+            result.mismatched.push([i, getValue(e)]);
+        }
+    });
+}
+return result;
+"""
+
+# opens a blank tab; webdriver stays on the current handle
+NEW_TAB = """
+window.open('about:blank', '_blank');
+"""
+
+# arguments: [[kind, by, value, text], ...]; kinds: present, absent, is_in, not_in, equal, not_equal
+# returns: one bool per condition
+CHECK_CONDITIONS = LOCATE + """
+return arguments[0].map(function (c) {
+    var found = locate(c[1], c[2], null);
+    if (c[0] === 'present') {
+        return found.length > 0;
+    } else if (c[0] === 'absent') {
+        return found.length === 0;
+    } else if (!found.length) {
+        return false;
+    }
+    var s = text(found[0]);
+    switch (c[0]) {
+        case 'is_in':
+            return s.indexOf(c[3]) !== -1;
+        case 'not_in':
+            return s.indexOf(c[3]) === -1;
+        case 'equal':
+            return s === c[3];
+        case 'not_equal':
+            return s !== c[3];
+    }
+    throw new Error('unknown condition: ' + c[0]);
+});
+"""
+
+# arguments: by, value, offset, attribute names
+# returns: {offset, total, items: [[element, text, {name: value}], ...]} for the elements from offset on,
+# then scrolls the last element into view; offset falls back to 0 when the list got shorter
+SCROLL_ITEMS = LOCATE + """
+var found = locate(arguments[0], arguments[1], null), names = arguments[3] || [];
+var offset = arguments[2] <= found.length ? arguments[2] : 0;
+var items = found.slice(offset).map(function (e) {
+    return [e, text(e), attributes(e, names)];
+});
+if (found.length) {
+    found[found.length - 1].scrollIntoView({block: 'end'});
+}
+return {offset: offset, total: found.length, items: items};
+"""
+
+# arguments: by, value
+COUNT_ELEMENTS = LOCATE + """
+return locate(arguments[0], arguments[1], null).length;
+"""
+
+READY_STATE = """
+return document.readyState;
+"""
@@ -0,0 +1,130 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pakselenium.utils.logs import logf
+
+_lock = threading.Lock()
+# keyed by pid as well, a forked worker starts its own service instead of using the parent's
+_services: Dict[Tuple[int, str], Service] = {}
+_spares: Dict[Tuple[int, str], 'Spares'] = {}
+
+
+class Spares(object):
+    # sessions created ahead in a background thread; take() hands one out and starts a replacement
+
+    def __init__(self, create: Callable[[], WebDriver], size: int):
+        assert size > 0
+        self.create = create
+        self.size = size
+        self._ready = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        for _ in range(size):
+            self._executor.submit(self._add)
+
+    def _add(self):
+        try:
+            self._ready.put(self.create())
+        except WebDriverException as e:
+            logf('[spares]: creating a session failed: %r', e, min_verbose=1)
+
+    @property
+    def ready(self) -> int:
+        return self._ready.qsize()
+
+    def take(self) -> WebDriver:
+        # a cold start only when no live spare is ready, the ones being created stay for the next take
+        for _ in range(self.size):
+            try:
+                driver = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self._executor.submit(self._add)
+            if _is_alive(driver):
+                return driver
+            logf('[spares]: dropped a dead session', min_verbose=1)
+            _quit(driver)
+        return self.create()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        drivers: List[WebDriver] = []
+        while not self._ready.empty():
+            drivers.append(self._ready.get_nowait())
+        for driver in drivers:
+            _quit(driver)
+
+
+def _is_alive(driver: WebDriver) -> bool:
+    # a spare may have waited long enough for chrome to crash or the session to time out
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver: WebDriver):
+    try:
+        driver.quit()
+    except WebDriverException:
+        pass
+
+
+def shared_service(driver_path: str, port: int = 0, service_args: List[str] = None,
+                   service_log_path: str = None) -> Service:
+    # one chromedriver per process and driver path, stopped at exit; the arguments of the first call start it
+    key = (os.getpid(), driver_path)
+    with _lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = Service(driver_path, port=port, service_args=service_args,
+                                               log_path=service_log_path)
+            service.start()
+            atexit.register(service.stop)
+            logf('[service]: started %s at %s', driver_path, service.service_url, min_verbose=1)
+        return service
+
+
+def chrome_capabilities(options: ChromeOptions = None, capabilities: dict = None) -> dict:
+    # merged the way webdriver.Chrome merges them
+    if options is None:
+        return capabilities if capabilities is not None else ChromeOptions().to_capabilities()
+    capabilities = dict(capabilities or {})
+    capabilities.update(options.to_capabilities())
+    return capabilities
+
+
+def chrome_session(driver_path: str, options: ChromeOptions = None, capabilities: dict = None,
+                   spares: int = 0, keep_alive: bool = True, port: int = 0, service_args: List[str] = None,
+                   service_log_path: str = None, chrome_options: ChromeOptions = None) -> WebDriver:
+    # a new session on the shared service; with spares > 0 it usually is one opened in advance.
+    # Takes the keyword arguments of webdriver.Chrome, chrome_options is the old name of options
+    service = shared_service(driver_path, port, service_args, service_log_path)
+    capabilities = chrome_capabilities(chrome_options if options is None else options, capabilities)
+
+    def create() -> WebDriver:
+        return webdriver.Remote(command_executor=ChromeRemoteConnection(remote_server_addr=service.service_url,
+                                                                        keep_alive=keep_alive),
+                                desired_capabilities=dict(capabilities))
+
+    if spares <= 0:
+        return create()
+    key = (os.getpid(), json.dumps([driver_path, capabilities], sort_keys=True, default=str))
+    with _lock:
+        pool = _spares.get(key)
+        if pool is None:
+            pool = _spares[key] = Spares(create, spares)
+            atexit.register(pool.close)
+    return pool.take()
@@ -0,0 +1,51 @@
+import gzip
+import json
+from typing import List
+
+
+def save_state(path: str, state: dict):
+    with gzip.open(path, 'wt', encoding='utf8') as f:
+        json.dump(state, f, separators=(',', ':'))
+
+
+def load_state(path: str) -> dict:
+    with gzip.open(path, 'rt', encoding='utf8') as f:
+        return json.load(f)
+
+
+def from_cdp_cookies(cookies: List[dict]) -> List[dict]:
+    # Network.getAllCookies -> selenium cookie dicts
+    converted = []
+    for cookie in cookies:
+        c = {k: cookie[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite')
+             if k in cookie}
+        if not cookie.get('session') and cookie.get('expires', -1) > 0:
+            c['expiry'] = int(cookie['expires'])
+        converted.append(c)
+    return converted
+
+
+def to_cdp_cookies(cookies: List[dict]) -> List[dict]:
+    # selenium cookie dicts -> Network.setCookies
+    converted = []
+    for cookie in cookies:
+        c = {k: cookie[k] for k in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite')
+             if k in cookie}
+        if 'expiry' in cookie:
+            c['expires'] = cookie['expiry']
+        converted.append(c)
+    return converted
+
+
+def storage_script(origin: str, local: dict, session: dict) -> str:
+    # evaluated on every new document before page scripts, writes only on the saved origin
+    return '''(function (origin, local, session) {
+    if (location.origin !== origin) {
+        return;
+    }
+    try {
+        Object.keys(local).forEach(function (k) { localStorage.setItem(k, local[k]); });
+        Object.keys(session).forEach(function (k) { sessionStorage.setItem(k, session[k]); });
+    } catch (e) {
+    }
+})(%s, %s, %s);''' % (json.dumps(origin), json.dumps(local), json.dumps(session))
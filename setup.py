@@ -9,5 +9,6 @@ setup(
     author='Ipakeev',
     author_email='ipakeev93@gmail.com',
     description='Selenium Wrapper',
-    install_requires=['selenium']
+    install_requires=['selenium'],
+    extras_require={'snapshot': ['lxml', 'cssselect'], 'lifecycle': ['psutil']}
 )